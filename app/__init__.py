@@ -4,11 +4,13 @@ from flask import Flask, jsonify
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
 from flask_mail import Mail
+from werkzeug.middleware.proxy_fix import ProxyFix
 from app.database.db_manager import DBManager
 from app.database.models.user import User
 from app.utils.error_messages import ERROR_MESSAGES
 from app.utils.response import error_response
 from app.utils.db_init import init_db
+from app.utils.json_provider import OrjsonProvider, OrjsonRequest
 
 # Import the token blocklist
 from app.database.token_blocklist import BLOCKLIST
@@ -32,6 +34,14 @@ mail = Mail()
 
 def create_app():
     app = Flask(__name__)
+    app.request_class = OrjsonRequest
+    app.json = OrjsonProvider(app)
+
+    # Trust X-Forwarded-For/-Proto from this many reverse proxies, so request.remote_addr
+    # is the real client (sign-in rate limiting and activity logs key on it). 0 disables.
+    proxy_hops = int(os.environ.get('TRUSTED_PROXY_HOPS', '1'))
+    if proxy_hops > 0:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=proxy_hops, x_proto=proxy_hops)
 
     # Initialize database on startup
     # We do this inside app context in case we switch to using current_app.config later
@@ -102,7 +112,7 @@ def create_app():
     # --- JWT User Claims ---
     def user_lookup_callback(_jwt_header, jwt_data):
         identity = jwt_data["sub"]
-        return User.find_by_id(identity)
+        return User.find_by_id_cached(identity)
 
     # Registering all JWT handlers explicitly to avoid linter warnings
     jwt.token_in_blocklist_loader(check_if_token_in_blocklist)
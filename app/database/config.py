@@ -1,6 +1,7 @@
 
 import os
 import pymysql.cursors
+from pymysql.constants import CLIENT
 from dotenv import load_dotenv
 
 # Load environment variables from a .env file if it exists
@@ -23,6 +24,8 @@ class Config:
         "database": os.getenv("DB_NAME"),
         "port": int(os.getenv("DB_PORT", 3306)),  # 🔑 TiDB Cloud uses 4000
         "cursorclass": pymysql.cursors.DictCursor,
+        # Report matched (not changed) rows from UPDATE, so rowcount can be used as an existence check
+        "client_flag": CLIENT.FOUND_ROWS,
         "ssl": {"ssl": {}}
     }
 
@@ -1,8 +1,13 @@
 
+import threading
+from contextlib import contextmanager
 from .base import get_db_connection
 from decimal import Decimal
 from datetime import datetime, date
 
+# Connection of the transaction currently open on this thread (see DBManager.transaction)
+_local = threading.local()
+
 # --- Centralized Normalization Functions ---
 
 def normalize_value(value):
@@ -31,6 +36,49 @@ class DBManager:
     This class abstracts away connection/cursor handling and normalizes output data.
     """
 
+    @staticmethod
+    @contextmanager
+    def transaction():
+        """
+        Run every DBManager call inside the block on one connection and commit
+        them together. Any exception rolls the whole block back and is re-raised.
+        Nested transaction() blocks join the outermost one.
+        """
+        if DBManager._in_transaction():
+            yield _local.conn
+            return
+
+        conn = get_db_connection()
+        _local.conn = conn
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            _local.conn = None
+            conn.close()
+
+    @staticmethod
+    def _in_transaction():
+        return getattr(_local, 'conn', None) is not None
+
+    @staticmethod
+    def _run_query(conn, query, params, fetch):
+        with conn.cursor() as cursor:
+            cursor.execute(query, params or ())
+
+            if fetch == 'one':
+                row = cursor.fetchone()
+                return normalize_row(row) if row else None
+
+            if fetch == 'all':
+                rows = cursor.fetchall()
+                return normalize_rows(rows) if rows else []
+
+            return None
+
     @staticmethod
     def execute_query(query, params=None, fetch=None):
         """
@@ -38,20 +86,12 @@ class DBManager:
         Supports fetch='one' or fetch='all'.
         Rolls back on error (to clear locks if any).
         """
+        if DBManager._in_transaction():
+            return DBManager._run_query(_local.conn, query, params, fetch)
+
         conn = get_db_connection()
         try:
-            with conn.cursor() as cursor:
-                cursor.execute(query, params or ())
-
-                if fetch == 'one':
-                    row = cursor.fetchone()
-                    return normalize_row(row) if row else None
-
-                if fetch == 'all':
-                    rows = cursor.fetchall()
-                    return normalize_rows(rows) if rows else []
-
-                return None
+            return DBManager._run_query(conn, query, params, fetch)
         except Exception as e:
             conn.rollback()  # rollback prevents dangling transactions/locks
             raise e
@@ -59,18 +99,25 @@ class DBManager:
             conn.close()
 
     @staticmethod
-    def execute_write_query(query, params=None):
+    def execute_write_query(query, params=None, return_rowcount=False):
         """
         Executes a write query (INSERT, UPDATE, DELETE).
         Commits if successful, rolls back on error.
-        Returns True if successful, otherwise raises.
+        Returns True if successful (or the matched row count when
+        return_rowcount is set), otherwise raises.
         """
+        if DBManager._in_transaction():
+            with _local.conn.cursor() as cursor:
+                cursor.execute(query, params or ())
+                return cursor.rowcount if return_rowcount else True
+
         conn = get_db_connection()
         try:
             with conn.cursor() as cursor:
                 cursor.execute(query, params or ())
+                rowcount = cursor.rowcount
             conn.commit()
-            return True
+            return rowcount if return_rowcount else True
         except Exception as e:
             conn.rollback()   # rollback ensures no partial insert/update
             raise e
@@ -83,6 +130,11 @@ class DBManager:
         Executes a bulk write query using executemany.
         params_list should be a list of tuples/lists.
         """
+        if DBManager._in_transaction():
+            with _local.conn.cursor() as cursor:
+                cursor.executemany(query, params_list or [])
+            return True
+
         conn = get_db_connection()
         try:
             with conn.cursor() as cursor:
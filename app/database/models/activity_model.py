@@ -2,6 +2,7 @@
 from .base_model import BaseModel
 from app.database.db_manager import DBManager
 import json
+from datetime import datetime, timezone
 
 class ActivityLog(BaseModel):
     _table_name = 'activity_logs'
@@ -15,7 +16,6 @@ class ActivityLog(BaseModel):
         self.details = details if isinstance(details, dict) else (json.loads(details) if details else {})
         self.ip_address = ip_address
         if isinstance(created_at, str):
-            from datetime import datetime
             try:
                 self.created_at = datetime.fromisoformat(created_at)
             except (ValueError, TypeError):
@@ -39,20 +39,34 @@ class ActivityLog(BaseModel):
             'created_at': self.created_at.isoformat() if self.created_at else None
         }
 
+    _INSERT_COLUMNS = ('id', 'user_id', 'action', 'entity_type', 'entity_id', 'details', 'ip_address', 'created_at')
+
     @classmethod
     def create_log(cls, user_id, action, entity_type, entity_id=None, details=None, ip_address=None):
+        """
+        Queue an activity log entry; it is written in the background by activity_queue.
+        created_at is stamped now so queueing delay does not shift the log time.
+        """
         from uuid6 import uuid7
+        from app.utils.activity_queue import activity_queue
         log_id = str(uuid7())
 
         details_json = json.dumps(details, default=str) if details else None
 
+        activity_queue.put((log_id, user_id, action, entity_type, entity_id, details_json, ip_address, datetime.now(timezone.utc)))
+        return log_id
+
+    @classmethod
+    def bulk_insert(cls, rows):
+        """Insert several (id, user_id, action, entity_type, entity_id, details, ip_address, created_at) rows at once."""
+        if not rows:
+            return
         query = f"""
             INSERT INTO {cls._table_name}
-            (id, user_id, action, entity_type, entity_id, details, ip_address)
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
+            ({', '.join(cls._INSERT_COLUMNS)})
+            VALUES ({', '.join(['%s'] * len(cls._INSERT_COLUMNS))})
         """
-        DBManager.execute_write_query(query, (log_id, user_id, action, entity_type, entity_id, details_json, ip_address))
-        return log_id
+        DBManager.execute_bulk_write_query(query, rows)
 
     @classmethod
     def list_logs(cls, user_id=None, entity_type=None, entity_id=None, limit=50, offset=0):
@@ -1,11 +1,41 @@
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Type, TypeVar, Tuple
 from uuid6 import uuid7
 from app.database.db_manager import DBManager
-from datetime import datetime, timezone
+from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal
 
 T = TypeVar("T", bound="BaseModel")
 
+# Largest IN (...) list a single bulk UPDATE binds
+_BULK_CHUNK_SIZE = 1000
+
+@lru_cache(maxsize=256)
+def _insert_sql(table: str, columns: Tuple[str, ...]) -> str:
+    """INSERT text for a table/column list; models insert the same few shapes over and over."""
+    return f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(['%s'] * len(columns))})"
+
+def date_range_filter(column: str, start_date: Optional[str] = None, end_date: Optional[str] = None) -> Tuple[List[str], List[Any]]:
+    """
+    WHERE clauses and params for an inclusive ?start_date=&end_date= filter on a DATE or
+    TIMESTAMP column, written as the half-open range column >= start AND column < end + 1 day.
+    Comparing the bare column keeps the range index-friendly, and a YYYY-MM-DD end date covers
+    that whole day even for timestamps. An end value that is not a plain date stays inclusive.
+    """
+    clauses: List[str] = []
+    params: List[Any] = []
+    if start_date:
+        clauses.append(f"{column} >= %s")
+        params.append(start_date)
+    if end_date:
+        try:
+            params.append(date.fromisoformat(end_date) + timedelta(days=1))
+            clauses.append(f"{column} < %s")
+        except (TypeError, ValueError):
+            params.append(end_date)
+            clauses.append(f"{column} <= %s")
+    return clauses, params
+
 class BaseModel:
     _table_name: Optional[str] = None
     _allowed_fields: set[str] = set()
@@ -21,13 +51,21 @@ class BaseModel:
                     value = datetime.fromisoformat(value)
                 except (ValueError, TypeError):
                     pass
-            elif key == 'price' and value is not None:
+            elif key == 'price' and value is not None and not isinstance(value, Decimal):
                 try:
                     value = Decimal(value)
                 except (ValueError, TypeError):
                     pass
             setattr(self, key, value)
 
+    @classmethod
+    def to_dict_list(cls: Type[T], instances: List[T]) -> List[Dict[str, Any]]:
+        """
+        Serialize a list of instances with the model's to_dict().
+        List finders only build instances from real rows, so no None filtering is needed.
+        """
+        return list(map(cls.to_dict, instances))
+
     @classmethod
     def _get_base_query(cls, include_deleted: bool = False) -> str:
         return f"SELECT * FROM {cls._table_name}" + ("" if include_deleted else " WHERE deleted_at IS NULL")
@@ -39,19 +77,19 @@ class BaseModel:
         data.setdefault("id", str(uuid7()))
         allowed: Dict[str, Any] = {k: v for k, v in data.items() if not cls._allowed_fields or k in cls._allowed_fields or k == "id"}
         allowed.setdefault("created_at", datetime.now(timezone.utc))
-        columns = ", ".join(allowed.keys())
-        placeholders = ", ".join(["%s"] * len(allowed))
-        query = f"INSERT INTO {cls._table_name} ({columns}) VALUES ({placeholders})"
+        query = _insert_sql(cls._table_name, tuple(allowed))
         try:
             DBManager.execute_write_query(query, tuple(allowed.values()))
             return data["id"]
         except Exception as e:
-            raise ValueError(f"Failed to create record in {cls._table_name}: {e}")
+            raise ValueError(f"Failed to create record in {cls._table_name}: {e}") from e
 
     @classmethod
     def bulk_create(cls: Type[T], data_list: List[Dict[str, Any]]) -> int:
         """
         Bulk insert multiple records.
+        PyMySQL's executemany() rewrites this INSERT ... VALUES (%s, ...) into a
+        single multi-row INSERT, so the whole list costs one round trip.
         """
         if not cls._table_name:
             raise ValueError("Model must define _table_name")
@@ -70,9 +108,8 @@ class BaseModel:
             filtered = {k: v for k, v in data.items() if not cls._allowed_fields or k in cls._allowed_fields or k == "id"}
             columns.update(filtered.keys())
 
-        sorted_columns = sorted(list(columns))
-        placeholders = ", ".join(["%s"] * len(sorted_columns))
-        query = f"INSERT INTO {cls._table_name} ({', '.join(sorted_columns)}) VALUES ({placeholders})"
+        sorted_columns = sorted(columns)
+        query = _insert_sql(cls._table_name, tuple(sorted_columns))
 
         for data in data_list:
             # Ensure all columns are present, default to None
@@ -116,28 +153,55 @@ class BaseModel:
         result = DBManager.execute_query(query, (id,), fetch='one')
         return cls.from_row(result)
 
+    @classmethod
+    def find_by_ids(cls: Type[T], ids: List[str], for_update: bool = False) -> Dict[str, T]:
+        """
+        Fetch several active records in one query.
+        Returns a dict keyed by id; missing ids are simply absent.
+        With for_update=True the rows stay locked until the surrounding
+        DBManager.transaction() ends.
+        """
+        unique_ids = list(dict.fromkeys(ids))
+        if not unique_ids:
+            return {}
+        placeholders = ", ".join(["%s"] * len(unique_ids))
+        query = f"SELECT * FROM {cls._table_name} WHERE deleted_at IS NULL AND id IN ({placeholders})"
+        if for_update:
+            query += " FOR UPDATE"
+        rows = DBManager.execute_query(query, tuple(unique_ids), fetch="all") or []
+        return {row["id"]: cls.from_row(row) for row in rows}
+
     @classmethod
     def _bulk_update(cls, ids: List[str], set_fields: Dict[str, Any], condition_deleted: Optional[bool] = None) -> int:
+        """
+        Apply set_fields to the given ids and return how many rows matched.
+        The connection reports matched rows (CLIENT.FOUND_ROWS), so the UPDATE's own
+        row count replaces a separate COUNT query. Long id lists are split into
+        _BULK_CHUNK_SIZE batches that commit together.
+        """
         if not cls._table_name or not ids:
             return 0
-        placeholders = ", ".join(["%s"] * len(ids))
+        unique_ids = list(dict.fromkeys(ids))
         set_clause = ", ".join([f"{k} = %s" for k in set_fields.keys()])
-        params = list(set_fields.values()) + ids
+        set_params = list(set_fields.values())
         condition = ""
         if condition_deleted is True:
             condition = "AND deleted_at IS NULL"
         elif condition_deleted is False:
             condition = "AND deleted_at IS NOT NULL"
 
-        count_query = f"SELECT COUNT(*) AS total FROM {cls._table_name} WHERE id IN ({placeholders}) {condition}"
-        total_rows = DBManager.execute_query(count_query, tuple(ids), fetch='one') or {}
-        total = int(total_rows.get("total", 0))
-        if total == 0:
-            return 0
+        def update_chunk(chunk: List[str]) -> int:
+            placeholders = ", ".join(["%s"] * len(chunk))
+            query = f"UPDATE {cls._table_name} SET {set_clause} WHERE id IN ({placeholders}) {condition}"
+            return DBManager.execute_write_query(query, tuple(set_params + chunk), return_rowcount=True)
 
-        query = f"UPDATE {cls._table_name} SET {set_clause} WHERE id IN ({placeholders}) {condition}"
-        DBManager.execute_write_query(query, tuple(params))
-        return total
+        if len(unique_ids) <= _BULK_CHUNK_SIZE:
+            return update_chunk(unique_ids)
+        with DBManager.transaction():
+            return sum(
+                update_chunk(unique_ids[i:i + _BULK_CHUNK_SIZE])
+                for i in range(0, len(unique_ids), _BULK_CHUNK_SIZE)
+            )
 
     @classmethod
     def soft_delete(cls, record_id: str) -> bool:
@@ -152,7 +216,12 @@ class BaseModel:
         return cls._bulk_update(ids, {"deleted_at": None, "updated_at": datetime.now(timezone.utc)}, condition_deleted=False)
 
     @classmethod
-    def find_with_pagination_and_count(cls: Type[T], page: int = 1, per_page: int = 10, include_deleted: bool = False, deleted_only: bool = False) -> Tuple[List[T], int]:
+    def find_with_pagination_and_count(cls: Type[T], page: int = 1, per_page: int = 10, include_deleted: bool = False, deleted_only: bool = False, after_id: Optional[str] = None, with_total: bool = True) -> Tuple[List[T], Optional[int]]:
+        """
+        Page through records in id order. With `after_id` the page starts right after
+        that record (keyset pagination) and `page` is ignored.
+        With `with_total=False` the COUNT query is skipped and the total is None.
+        """
         offset = (page - 1) * per_page
 
         # Build query based on deleted_only flag
@@ -163,9 +232,17 @@ class BaseModel:
             base_query = cls._get_base_query(include_deleted)
             count_query = f"SELECT COUNT(*) AS count FROM {cls._table_name}" + ("" if include_deleted else " WHERE deleted_at IS NULL")
 
-        results: List[Dict[str, Any]] = DBManager.execute_query(f"{base_query} LIMIT %s OFFSET %s", (per_page, offset), fetch='all') or []
+        if after_id:
+            clause = "AND" if "WHERE" in base_query else "WHERE"
+            page_query, params = f"{base_query} {clause} id > %s ORDER BY id LIMIT %s", (after_id, per_page)
+        else:
+            page_query, params = f"{base_query} ORDER BY id LIMIT %s OFFSET %s", (per_page, offset)
+
+        results: List[Dict[str, Any]] = DBManager.execute_query(page_query, params, fetch='all') or []
         items = [cls.from_row(r) for r in results if r]
 
+        if not with_total:
+            return items, None
         total = int((DBManager.execute_query(count_query, fetch='one') or {}).get("count", 0))
         return items, total
 
@@ -1,7 +1,14 @@
+import os
 from typing import Any, Dict, List, Optional, Tuple
-from datetime import datetime, date
+from datetime import datetime, date, timezone
+import pymysql
 from .base_model import BaseModel
 from app.database.db_manager import DBManager
+from app.utils.ttl_cache import TTLCache
+
+# Active customers by id for invoice/payment side lookups (emails, payment links).
+# Writers through this model invalidate their entries; the TTL bounds cross-worker staleness.
+_customer_cache = TTLCache(max_entries=10000, ttl_seconds=float(os.getenv("CUSTOMER_CACHE_TTL_SECONDS", "30")))
 
 
 def to_iso(dt: Any) -> Optional[str]:
@@ -57,12 +64,58 @@ class Customer(BaseModel):
         return None
 
     @classmethod
-    def create_customer(cls, data: Dict[str, Any]) -> str:
-        return super().create(data)
+    def create_customer(cls, data: Dict[str, Any]) -> Optional[str]:
+        """
+        Insert a customer and return its id, or None if the email is already taken.
+        The UNIQUE index on email does the conflict check, so there is no
+        SELECT-then-INSERT race and the happy path is a single round trip.
+        """
+        try:
+            return super().create(data)
+        except ValueError as e:
+            cause = e.__cause__
+            if isinstance(cause, pymysql.err.IntegrityError) and cause.args[0] == 1062:
+                return None
+            raise
 
     @classmethod
     def update_customer(cls, record_id: str, data: Dict[str, Any]) -> bool:
-        return super().update(record_id, data)
+        """
+        Update an active customer in a single statement.
+        Returns False when no active customer matched the id.
+        """
+        data = {k: v for k, v in data.items() if k in cls._allowed_fields}
+        data["updated_at"] = datetime.now(timezone.utc)
+        set_clause = ", ".join([f"{k} = %s" for k in data.keys()])
+        query = f"UPDATE {cls._table_name} SET {set_clause} WHERE id = %s AND deleted_at IS NULL"
+        try:
+            matched = DBManager.execute_write_query(query, tuple(list(data.values()) + [record_id]), return_rowcount=True)
+        except Exception as e:
+            raise ValueError(f"Failed to update record in {cls._table_name}: {e}") from e
+        finally:
+            cls.invalidate_cache(record_id)
+        return matched > 0
+
+    @classmethod
+    def find_by_id_cached(cls, customer_id: str) -> Optional["Customer"]:
+        """Active customer by id, served from a short-lived cache shared across requests."""
+        customer = _customer_cache.get(customer_id)
+        if customer is None:
+            customer = cls.find_by_id(customer_id)
+            if customer:
+                _customer_cache.set(customer_id, customer)
+        return customer
+
+    @classmethod
+    def invalidate_cache(cls, *customer_ids: str) -> None:
+        _customer_cache.invalidate(*customer_ids)
+
+    @classmethod
+    def _bulk_update(cls, ids: List[str], set_fields: Dict[str, Any], condition_deleted: Optional[bool] = None) -> int:
+        try:
+            return super()._bulk_update(ids, set_fields, condition_deleted)
+        finally:
+            cls.invalidate_cache(*ids)
 
     @classmethod
     def find_by_email(cls, email: str, include_deleted: bool = False) -> Optional["Customer"]:
@@ -194,7 +247,7 @@ class Customer(BaseModel):
         final_params = params + ([status] if status else []) + [limit, offset]
 
         rows = DBManager.execute_query(final_query, tuple(final_params), fetch='all') or []
-        customers = [c for row in rows if (c := cls.from_row(row if isinstance(row, dict) else None)) is not None]
+        customers = [cls(**row) for row in rows]
 
         count_query = f"SELECT COUNT(*) AS total FROM ({base_query}) AS sub {outer_where}"
         count_params = tuple(params + ([status] if status else []))
@@ -1,7 +1,28 @@
+from typing import List
 from .base_model import BaseModel
 from app.database.db_manager import DBManager
 from datetime import datetime, date
-from decimal import Decimal
+from decimal import Decimal, ROUND_HALF_UP
+
+
+def _split_prefixed(row, prefix):
+    """Pull the `prefix`-aliased columns of a joined row back out under their own names."""
+    return {key[len(prefix):]: value for key, value in row.items() if key.startswith(prefix)}
+
+# Invoice columns rendered by to_dict(); the list view selects only these
+_LIST_COLUMNS = ", ".join(f"i.{column}" for column in (
+    'id', 'invoice_number', 'customer_id', 'user_id', 'due_date', 'subtotal_amount', 'discount_amount',
+    'tax_percent', 'tax_amount', 'total_amount', 'status', 'created_at', 'updated_at',
+))
+
+_CENTS = Decimal('0.01')
+
+
+def _to_cents(value) -> Decimal:
+    """Round a money value to 2 places the way a MySQL DECIMAL(x,2) column stores it."""
+    value = value if isinstance(value, Decimal) else Decimal(str(value))
+    return value.quantize(_CENTS, rounding=ROUND_HALF_UP)
+
 
 class Invoice(BaseModel):
     _table_name = 'invoices'
@@ -23,12 +44,16 @@ class Invoice(BaseModel):
             setattr(self, key, value)
 
     def to_dict(self):
+        # Written as one dict literal on purpose: a field-tuple/attrgetter loop measured slower
+        created_at = getattr(self, 'created_at', None)
+        due_date = getattr(self, 'due_date', None)
+        updated_at = getattr(self, 'updated_at', None)
         return {
             "id": self.id,
             "invoice_number": self.invoice_number,
             "user_id": getattr(self, "user_id", None),
-            "created_at": self.created_at.isoformat() if getattr(self, 'created_at', None) else None,
-            "due_date": self.due_date.isoformat() if getattr(self, 'due_date', None) else None,
+            "created_at": created_at.isoformat() if created_at else None,
+            "due_date": due_date.isoformat() if due_date else None,
             "subtotal_amount": float(self.subtotal_amount),
             "discount_amount": float(self.discount_amount),
             "tax_percent": float(self.tax_percent),
@@ -37,7 +62,7 @@ class Invoice(BaseModel):
             "due_amount": float(getattr(self, 'due_amount', 0.0)),
             "amount_paid": float(getattr(self, 'amount_paid', 0.0)),
             "status": self.status,
-            "updated_at": self.updated_at.isoformat() if getattr(self, 'updated_at', None) else None,
+            "updated_at": updated_at.isoformat() if updated_at else None,
             "customer": {
                 "id": getattr(self, "customer_id", None),
                 "name": getattr(self, "customer_name", None),
@@ -53,6 +78,21 @@ class Invoice(BaseModel):
     def create_invoice(cls, data):
         return super().create(data)
 
+    @classmethod
+    def from_created(cls, data, amount_paid=Decimal('0')):
+        """
+        Build the Invoice that find_by_id() would return right after create_invoice(data),
+        without reading it back. Money columns are rounded half away from zero to 2 places,
+        as MySQL stores the full-precision Decimals in DECIMAL(10,2) columns.
+        """
+        row = dict(data)
+        for field in ('subtotal_amount', 'discount_amount', 'tax_percent', 'tax_amount', 'total_amount'):
+            if row.get(field) is not None:
+                row[field] = _to_cents(row[field])
+        amount_paid = _to_cents(amount_paid)
+        row.setdefault('updated_at', None)
+        return cls(**row, amount_paid=amount_paid, due_amount=row['total_amount'] - amount_paid)
+
     @classmethod
     def update(cls, invoice_id, data):
         if not data:
@@ -88,6 +128,67 @@ class Invoice(BaseModel):
         row = DBManager.execute_query(query, (invoice_id,), fetch='one')
         return cls.from_row(row)
 
+    @classmethod
+    def find_with_details(cls, invoice_id, include_deleted=False):
+        """
+        Load an invoice together with its customer, line items and latest payment
+        in a single round trip. Returns the Invoice with `customer`, `items` and
+        `latest_payment` attributes set, or None if the invoice does not exist.
+        """
+        from app.database.models.customer import Customer
+        from app.database.models.invoice_item_model import InvoiceItem
+        from app.database.models.payment import Payment
+
+        query = f"""
+            SELECT i.*,
+                   COALESCE(pa.amount_paid, 0) AS amount_paid,
+                   (i.total_amount - COALESCE(pa.amount_paid, 0)) AS due_amount,
+                   c.id AS c__id, c.name AS c__name, c.email AS c__email, c.phone AS c__phone,
+                   c.address AS c__address, c.gst_number AS c__gst_number,
+                   c.created_at AS c__created_at, c.updated_at AS c__updated_at, c.deleted_at AS c__deleted_at,
+                   ii.id AS ii__id, ii.product_id AS ii__product_id, ii.quantity AS ii__quantity,
+                   ii.price AS ii__price, ii.total AS ii__total,
+                   pr.name AS ii__product_name, pr.product_code AS ii__product_code,
+                   pr.description AS ii__product_description, pr.stock AS ii__stock,
+                   lp.id AS lp__id, lp.amount AS lp__amount, lp.payment_date AS lp__payment_date,
+                   lp.method AS lp__method, lp.reference_no AS lp__reference_no, lp.created_at AS lp__created_at
+            FROM {cls._table_name} i
+            LEFT JOIN (
+                SELECT invoice_id, SUM(amount) AS amount_paid FROM payments WHERE invoice_id = %s GROUP BY invoice_id
+            ) pa ON pa.invoice_id = i.id
+            LEFT JOIN customers c ON c.id = i.customer_id AND c.deleted_at IS NULL
+            LEFT JOIN invoice_items ii ON ii.invoice_id = i.id AND ii.deleted_at IS NULL
+            LEFT JOIN products pr ON pr.id = ii.product_id
+            LEFT JOIN (
+                SELECT * FROM payments WHERE invoice_id = %s ORDER BY payment_date DESC LIMIT 1
+            ) lp ON lp.invoice_id = i.id
+            WHERE i.id = %s
+        """
+        if not include_deleted:
+            query += " AND i.deleted_at IS NULL"
+        query += " ORDER BY ii.id"
+
+        rows = DBManager.execute_query(query, (invoice_id, invoice_id, invoice_id), fetch='all')
+        if not rows:
+            return None
+
+        first = rows[0]
+        invoice = cls.from_row({k: v for k, v in first.items() if '__' not in k})
+
+        customer_row = _split_prefixed(first, 'c__')
+        invoice.customer = Customer.from_row(customer_row) if customer_row['id'] else None
+
+        invoice.items = []
+        for row in rows:
+            item_row = _split_prefixed(row, 'ii__')
+            if item_row['id']:
+                invoice.items.append(InvoiceItem.from_row({**item_row, 'invoice_id': invoice.id}))
+
+        payment_row = _split_prefixed(first, 'lp__')
+        invoice.latest_payment = Payment.from_row({**payment_row, 'invoice_id': invoice.id}) if payment_row['id'] else None
+
+        return invoice
+
     @classmethod
     def find_by_invoice_number(cls, invoice_number):
         query = "SELECT * FROM invoices WHERE invoice_number = %s AND deleted_at IS NULL"
@@ -95,7 +196,12 @@ class Invoice(BaseModel):
         return cls.from_row(row)
 
     @classmethod
-    def list_all(cls, customer_id=None, status=None, offset=0, limit=10, q=None, include_deleted=False, deleted_only=False):
+    def list_all(cls, customer_id=None, status=None, offset=0, limit=10, q=None, include_deleted=False, deleted_only=False, after_id=None):
+        """
+        Page through invoices newest first (ids are time-ordered UUIDv7).
+        With `after_id` the page starts right after that invoice (keyset pagination)
+        and `offset` is ignored, so deep pages cost the same as the first one.
+        """
         where = []
         if deleted_only:
             where.append("i.deleted_at IS NOT NULL")
@@ -103,18 +209,6 @@ class Invoice(BaseModel):
             where.append("i.deleted_at IS NULL")
 
         params = []
-        query_base = """
-            SELECT i.*,
-                   c.id AS customer_id,
-                   c.name AS customer_name,
-                   c.phone AS customer_phone,
-                   COALESCE(SUM(p.amount), 0) AS amount_paid,
-                   (i.total_amount - COALESCE(SUM(p.amount), 0)) AS due_amount
-            FROM invoices i
-            JOIN customers c ON i.customer_id = c.id
-            LEFT JOIN payments p ON i.id = p.invoice_id
-        """
-
         if customer_id:
             where.append("i.customer_id = %s")
             params.append(customer_id)
@@ -127,22 +221,53 @@ class Invoice(BaseModel):
             params.extend([like_q, like_q])
 
         where_sql = " WHERE " + " AND ".join(where) if where else ""
-        group_by_sql = " GROUP BY i.id, c.id, c.name, c.phone ORDER BY i.id DESC LIMIT %s OFFSET %s"
-        final_query = query_base + where_sql + group_by_sql
-        params.extend([limit, offset])
-
-        rows = DBManager.execute_query(final_query, tuple(params), fetch='all')
-        invoices = [cls.from_row(row) for row in rows] if rows else []
+        count_query_params = tuple(params)
 
-        count_query_params = tuple(params[:-2])
-        count_query = """
-            SELECT COUNT(DISTINCT i.id) as total
+        # The seek predicate only applies to the page query, not to the total count
+        page_where = where + ["i.id < %s"] if after_id else where
+        page_where_sql = " WHERE " + " AND ".join(page_where) if page_where else ""
+        page_params = params + [after_id] if after_id else list(params)
+        # Without a seek predicate the page query sees exactly the counted rows,
+        # so the total rides along as a window aggregate instead of a second scan
+        window_total = "" if after_id else ", COUNT(*) OVER () AS _total"
+        page_query = f"""
+            SELECT {_LIST_COLUMNS},
+                   c.name AS customer_name,
+                   c.phone AS customer_phone{window_total}
             FROM invoices i
             JOIN customers c ON i.customer_id = c.id
-        """ + where_sql
+        """ + page_where_sql + " ORDER BY i.id DESC LIMIT %s OFFSET %s"
+        page_params.extend([limit, 0 if after_id else offset])
+
+        # Cut the page first, then sum payments only for the invoices on it
+        final_query = f"""
+            SELECT pg.*, pg.total_amount - pg.amount_paid AS due_amount
+            FROM (
+                SELECT page.*,
+                       (SELECT COALESCE(SUM(p.amount), 0) FROM payments p WHERE p.invoice_id = page.id) AS amount_paid
+                FROM ({page_query}) page
+            ) pg
+            ORDER BY pg.id DESC
+        """
+
+        rows = DBManager.execute_query(final_query, tuple(page_params), fetch='all') or []
+        totals = [row.pop('_total', None) for row in rows]
+        invoices = [cls.from_row(row) for row in rows]
+
+        if totals and totals[0] is not None:
+            total = int(totals[0])
+        elif not rows and not after_id and offset == 0:
+            total = 0
+        else:
+            # Keyset page, or a page past the end: count separately
+            count_query = """
+                SELECT COUNT(DISTINCT i.id) as total
+                FROM invoices i
+                JOIN customers c ON i.customer_id = c.id
+            """ + where_sql
 
-        count_result = DBManager.execute_query(count_query, count_query_params, fetch='one')
-        total = count_result['total'] if count_result else 0
+            count_result = DBManager.execute_query(count_query, count_query_params, fetch='one')
+            total = count_result['total'] if count_result else 0
 
         return invoices, total
 
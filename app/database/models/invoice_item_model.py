@@ -16,10 +16,8 @@ class InvoiceItem(BaseModel):
         if hasattr(self, 'quantity') and self.quantity is not None:
             self.quantity = int(self.quantity)
 
-        if hasattr(self, 'price') and self.price is not None:
-            self.price = Decimal(self.price)
-
-        if hasattr(self, 'total') and self.total is not None:
+        # price is already a Decimal from BaseModel; only total may still need converting
+        if getattr(self, 'total', None) is not None and not isinstance(self.total, Decimal):
             self.total = Decimal(self.total)
 
     def to_dict(self):
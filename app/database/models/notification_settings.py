@@ -24,63 +24,58 @@ class NotificationSettings(BaseModel):
     def from_row(cls, row):
         return cls(**row) if row else None
 
+    @classmethod
+    def find_by_user_id(cls, user_id):
+        query = f"SELECT * FROM {cls._table_name} WHERE user_id = %s"
+        row = DBManager.execute_query(query, (user_id,), fetch='one')
+        return cls.from_row(row)
+
     @classmethod
     def get_user_settings(cls, user_id):
         """
         Get notification settings for a user.
         Creates default settings if none exist.
         """
-        query = f"SELECT * FROM {cls._table_name} WHERE user_id = %s"
-        row = DBManager.execute_query(query, (user_id,), fetch='one')
-
-        if row:
-            return cls.from_row(row)
-
-        # Create default settings if none exist
-        return cls.create_default_settings(user_id)
+        return cls.find_by_user_id(user_id) or cls.create_default_settings(user_id)
 
     @classmethod
     def create_default_settings(cls, user_id):
         """
         Create default notification settings for a user (all enabled).
+        A concurrent request may create them first; the unique user_id key turns
+        that into a no-op instead of an error.
         """
-        from uuid6 import uuid7
-        settings_id = str(uuid7())
-
-        query = f"""
-            INSERT INTO {cls._table_name}
-            (id, user_id, invoice_created, payment_received, invoice_overdue)
-            VALUES (%s, %s, TRUE, TRUE, TRUE)
-        """
-        DBManager.execute_write_query(query, (settings_id, user_id))
-
-        return cls.get_user_settings(user_id)
+        return cls._upsert(user_id, {})
 
     @classmethod
     def update_settings(cls, user_id, data):
         """
-        Update notification settings for a user.
+        Update notification settings for a user, creating them first if needed.
         """
-        # Ensure settings exist
-        settings = cls.get_user_settings(user_id)
-
-        set_clauses = []
-        params = []
+        values = {key: bool(data[key]) for key in ('invoice_created', 'payment_received', 'invoice_overdue') if key in data}
+        if not values:
+            return cls.get_user_settings(user_id)
+        return cls._upsert(user_id, values)
 
-        for key in ['invoice_created', 'payment_received', 'invoice_overdue']:
-            if key in data:
-                set_clauses.append(f"{key} = %s")
-                params.append(bool(data[key]))
-
-        if not set_clauses:
-            return settings
-
-        query = f"UPDATE {cls._table_name} SET {', '.join(set_clauses)} WHERE user_id = %s"
-        params.append(user_id)
+    @classmethod
+    def _upsert(cls, user_id, values):
+        """
+        Insert the user's settings row (column defaults fill anything not in `values`)
+        or, if it already exists, apply `values` to it; then read it back.
+        """
+        from uuid6 import uuid7
 
-        DBManager.execute_write_query(query, tuple(params))
+        columns = ['id', 'user_id', *values]
+        placeholders = ", ".join(["%s"] * len(columns))
+        updates = ", ".join(f"{key} = VALUES({key})" for key in values) or "user_id = user_id"
+        query = f"""
+            INSERT INTO {cls._table_name} ({', '.join(columns)})
+            VALUES ({placeholders})
+            ON DUPLICATE KEY UPDATE {updates}
+        """
+        DBManager.execute_write_query(query, (str(uuid7()), user_id, *values.values()))
 
-        return cls.get_user_settings(user_id)
+        return cls.find_by_user_id(user_id)
 
     @classmethod
     def is_notification_enabled(cls, user_id, notification_type):
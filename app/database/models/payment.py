@@ -1,4 +1,4 @@
-from .base_model import BaseModel
+from .base_model import BaseModel, date_range_filter
 from app.database.db_manager import DBManager
 from decimal import Decimal
 from datetime import date, datetime
@@ -43,6 +43,17 @@ class Payment(BaseModel):
     def record_payment(cls, data):
         return super().create(data)
 
+    @classmethod
+    def from_created(cls, data):
+        """
+        Build the Payment that find_by_id() would return right after create(data),
+        without reading it back. The amount is rounded the way DBManager writes it.
+        """
+        row = dict(data)
+        row['amount'] = Decimal("%.2f" % row['amount'])
+        row.setdefault('reference_no', None)
+        return cls(**row)
+
     @classmethod
     def find_by_id(cls, payment_id):
         query = f"SELECT * FROM {cls._table_name} WHERE id = %s"
@@ -63,19 +74,35 @@ class Payment(BaseModel):
         return cls.from_row(row) if row else None
 
     @classmethod
-    def find_with_pagination_and_count(cls, page=1, per_page=10):
+    def find_with_pagination_and_count(cls, page=1, per_page=10, after_id=None, with_total=True):
+        """
+        Page through payments, newest payment_date first (id breaks ties).
+        With `after_id` the page starts right after that payment (keyset pagination)
+        and `page` is ignored. With `with_total=False` the COUNT is skipped and the total is None.
+        """
         offset = (page - 1) * per_page
+        seek_join = seek_where = ""
+        params = []
+        if after_id:
+            # The cursor only carries the id; its payment_date is looked up in the same query
+            seek_join = f"JOIN (SELECT payment_date AS seek_date FROM {cls._table_name} WHERE id = %s) seek"
+            seek_where = "AND (p.payment_date < seek.seek_date OR (p.payment_date = seek.seek_date AND p.id < %s))"
+            params = [after_id, after_id]
+            offset = 0
         query = f"""
             SELECT p.*, i.invoice_number, c.name as customer_name, c.email as customer_email
             FROM {cls._table_name} p
             JOIN invoices i ON p.invoice_id = i.id
             JOIN customers c ON i.customer_id = c.id
-            WHERE p.deleted_at IS NULL
-            ORDER BY p.payment_date DESC
+            {seek_join}
+            WHERE p.deleted_at IS NULL {seek_where}
+            ORDER BY p.payment_date DESC, p.id DESC
             LIMIT %s OFFSET %s
         """
-        rows = DBManager.execute_query(query, (per_page, offset), fetch='all')
+        rows = DBManager.execute_query(query, (*params, per_page, offset), fetch='all')
         items = [cls.from_row(row) for row in rows] if rows else []
+        if not with_total:
+            return items, None
 
         count_query = f"SELECT COUNT(*) as total FROM {cls._table_name} WHERE deleted_at IS NULL"
         count_result = DBManager.execute_query(count_query, fetch='one')
@@ -84,17 +111,39 @@ class Payment(BaseModel):
         return items, total
 
     @classmethod
-    def find_by_invoice_id_with_pagination_and_count(cls, invoice_id, page=1, per_page=10):
+    def find_page_for_invoice(cls, invoice_id, page=1, per_page=10, with_total=True):
+        """
+        Page through an invoice's payments, newest first, checking that the invoice
+        exists in the same query. Returns (payments, total), or None if the invoice
+        does not exist (or is deleted). With `with_total=False` the total is None.
+        """
         offset = (page - 1) * per_page
-        query = f"SELECT * FROM {cls._table_name} WHERE invoice_id = %s AND deleted_at IS NULL ORDER BY payment_date DESC LIMIT %s OFFSET %s"
+        window_total = ", COUNT(p.id) OVER () AS _total" if with_total else ""
+        # LEFT JOIN keeps one all-NULL payment row for an invoice without payments
+        query = f"""
+            SELECT p.*{window_total}
+            FROM invoices i
+            LEFT JOIN {cls._table_name} p ON p.invoice_id = i.id AND p.deleted_at IS NULL
+            WHERE i.id = %s AND i.deleted_at IS NULL
+            ORDER BY p.payment_date DESC
+            LIMIT %s OFFSET %s
+        """
         rows = DBManager.execute_query(query, (invoice_id, per_page, offset), fetch='all')
-        items = [cls.from_row(row) for row in rows] if rows else []
-
-        count_query = f"SELECT COUNT(*) as total FROM {cls._table_name} WHERE invoice_id = %s AND deleted_at IS NULL"
+        if rows:
+            totals = [row.pop('_total', None) for row in rows]
+            total = int(totals[0]) if with_total else None
+            return [cls.from_row(row) for row in rows if row['id'] is not None], total
+
+        # Page past the end (or no invoice): check existence and count directly
+        count_query = f"""
+            SELECT (SELECT COUNT(*) FROM {cls._table_name} WHERE invoice_id = i.id AND deleted_at IS NULL) AS total
+            FROM invoices i
+            WHERE i.id = %s AND i.deleted_at IS NULL
+        """
         count_result = DBManager.execute_query(count_query, (invoice_id,), fetch='one')
-        total = count_result['total'] if count_result else 0
-
-        return items, total
+        if not count_result:
+            return None
+        return [], count_result['total'] if with_total else None
 
     @classmethod
     def get_total_paid(cls, invoice_id):
@@ -125,13 +174,9 @@ class Payment(BaseModel):
             where_clauses.append("p.reference_no LIKE %s")
             params.append(f"%{reference_no}%")
 
-        if start_date:
-            where_clauses.append("p.payment_date >= %s")
-            params.append(start_date)
-
-        if end_date:
-            where_clauses.append("p.payment_date <= %s")
-            params.append(end_date)
+        range_clauses, range_params = date_range_filter("p.payment_date", start_date, end_date)
+        where_clauses.extend(range_clauses)
+        params.extend(range_params)
 
         where_sql = " WHERE " + " AND ".join(where_clauses) if where_clauses else ""
 
@@ -140,7 +185,7 @@ class Payment(BaseModel):
             SELECT p.*
             FROM {cls._table_name} p
             {where_sql}
-            ORDER BY p.payment_date DESC
+            ORDER BY p.payment_date DESC, p.id DESC
             LIMIT %s OFFSET %s
         """
         params.extend([per_page, offset])
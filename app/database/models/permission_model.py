@@ -1,6 +1,11 @@
+import os
 from .base_model import BaseModel
 from app.database.db_manager import DBManager
-from typing import List, Optional
+from app.utils.ttl_cache import TTLCache
+from typing import FrozenSet, List, Optional
+
+# Active permission names per user for require_permission(); grants and revokes invalidate
+_permission_cache = TTLCache(max_entries=10000, ttl_seconds=float(os.getenv("PERMISSION_CACHE_TTL_SECONDS", "30")))
 
 class UserPermission(BaseModel):
     _table_name = 'user_permissions'
@@ -18,11 +23,14 @@ class UserPermission(BaseModel):
         if permission not in PERMISSIONS:
             raise ValueError(f"Invalid permission: {permission}")
 
-        return cls.create({
-            'user_id': user_id,
-            'permission': permission,
-            'granted_by': granted_by
-        })
+        try:
+            return cls.create({
+                'user_id': user_id,
+                'permission': permission,
+                'granted_by': granted_by
+            })
+        finally:
+            cls.invalidate_cache(user_id)
 
     @classmethod
     def revoke_permission(cls, user_id: str, permission: str) -> bool:
@@ -32,7 +40,10 @@ class UserPermission(BaseModel):
             SET deleted_at = NOW()
             WHERE user_id = %s AND permission = %s AND deleted_at IS NULL
         """
-        DBManager.execute_write_query(query, (user_id, permission))
+        try:
+            DBManager.execute_write_query(query, (user_id, permission))
+        finally:
+            cls.invalidate_cache(user_id)
         return True
 
     @classmethod
@@ -46,6 +57,19 @@ class UserPermission(BaseModel):
         rows = DBManager.execute_query(query, (user_id,), fetch='all')
         return [row['permission'] for row in rows] if rows else []
 
+    @classmethod
+    def get_user_permissions_cached(cls, user_id: str) -> FrozenSet[str]:
+        """get_user_permissions() as a set, served from a short-lived cache."""
+        permissions = _permission_cache.get(user_id)
+        if permissions is None:
+            permissions = frozenset(cls.get_user_permissions(user_id))
+            _permission_cache.set(user_id, permissions)
+        return permissions
+
+    @classmethod
+    def invalidate_cache(cls, *user_ids: str) -> None:
+        _permission_cache.invalidate(*user_ids)
+
     @classmethod
     def bulk_grant_permissions(cls, user_id: str, permissions: List[str], granted_by: str) -> int:
         """Grant multiple permissions to a user"""
@@ -71,10 +95,13 @@ class UserPermission(BaseModel):
             SET deleted_at = NOW()
             WHERE user_id = %s AND deleted_at IS NULL
         """
-        DBManager.execute_write_query(query, (user_id,))
+        try:
+            DBManager.execute_write_query(query, (user_id,))
 
-        # Grant new permissions
-        return cls.bulk_grant_permissions(user_id, permissions, granted_by)
+            # Grant new permissions
+            return cls.bulk_grant_permissions(user_id, permissions, granted_by)
+        finally:
+            cls.invalidate_cache(user_id)
 
     @classmethod
     def get_users_with_permission(cls, permission: str) -> List[str]:
@@ -1,4 +1,5 @@
 from typing import Any, Dict, List, Optional, Type, TypeVar, Tuple
+from datetime import datetime, timezone
 from decimal import Decimal
 from app.database.db_manager import DBManager
 from app.utils.utils import generate_unique_product_code
@@ -42,10 +43,12 @@ class Product(BaseModel):
         return super().create(data)
 
     @classmethod
-    def update_product(cls, record_id: str, data: Dict[str, Any]) -> bool:
+    def update_product(cls: Type[T], record_id: str, data: Dict[str, Any]) -> Optional[T]:
         """
         Update product fields safely, including optional stock change.
         Use `stock_change` key to increment/decrement stock atomically.
+        Issues a single UPDATE and returns the re-read product, or None if no active
+        product has this id.
         """
         data = dict(data)  # copy to avoid mutation
 
@@ -56,17 +59,52 @@ class Product(BaseModel):
             except Exception:
                 data["price"] = Decimal("0.00")
 
-        # Handle atomic stock change
         stock_change = data.pop("stock_change", None)
-        if stock_change is not None:
-            query = f"""
-                UPDATE {cls._table_name}
-                SET stock = stock + %s, updated_at = NOW()
-                WHERE id = %s AND deleted_at IS NULL
-            """
-            DBManager.execute_write_query(query, (int(stock_change), record_id))
-
-        return super().update(record_id, data)
+        data = {k: v for k, v in data.items() if k in cls._allowed_fields}
+        assignments = [f"{k} = %s" for k in data.keys()]
+        params: List[Any] = list(data.values())
+
+        # Atomic stock change; an explicit stock value wins, as it always has
+        if stock_change is not None and "stock" not in data:
+            assignments.append("stock = stock + %s")
+            params.append(int(stock_change))
+
+        assignments.append("updated_at = %s")
+        params.extend([datetime.now(timezone.utc), record_id])
+        query = f"""
+            UPDATE {cls._table_name}
+            SET {", ".join(assignments)}
+            WHERE id = %s AND deleted_at IS NULL
+        """
+        try:
+            DBManager.execute_write_query(query, tuple(params))
+        except Exception as e:
+            raise ValueError(f"Failed to update record in {cls._table_name}: {e}")
+
+        # MySQL has no UPDATE ... RETURNING; the one read both fetches the row and tells a 404 apart
+        return cls.find_by_id(record_id)
+
+    @classmethod
+    def bulk_adjust_stock(cls, changes: Dict[str, int]) -> None:
+        """
+        Apply several relative stock changes ({product_id: delta}) in one UPDATE.
+        Zero deltas are skipped.
+        """
+        changes = {pid: int(delta) for pid, delta in changes.items() if delta}
+        if not changes:
+            return
+        case_sql = " ".join(["WHEN %s THEN %s"] * len(changes))
+        placeholders = ", ".join(["%s"] * len(changes))
+        query = f"""
+            UPDATE {cls._table_name}
+            SET stock = stock + CASE id {case_sql} END, updated_at = NOW()
+            WHERE deleted_at IS NULL AND id IN ({placeholders})
+        """
+        params: List[Any] = []
+        for pid, delta in changes.items():
+            params.extend([pid, delta])
+        params.extend(changes.keys())
+        DBManager.execute_write_query(query, tuple(params))
 
     @classmethod
     def search_product(cls: Type[T], search_term: str, include_deleted: bool = False) -> Tuple[List[T], int]:
@@ -1,8 +1,41 @@
+import os
+from functools import wraps
+from threading import Lock
+
 from app.database.db_manager import DBManager
+from app.database.models.base_model import date_range_filter
+from app.utils.ttl_cache import TTLCache
 from datetime import datetime, timedelta
 
+# Report results per (report, generation, arguments). Invoice and payment writes bump
+# the generation, so a report computed before a write is never stored under the new one.
+_report_cache = TTLCache(max_entries=128, ttl_seconds=float(os.getenv("REPORT_CACHE_TTL_SECONDS", "60")))
+_generation = 0
+_generation_lock = Lock()
+
+
+def invalidate_report_cache():
+    """Make every cached report in this worker stale; call after writing invoices or payments."""
+    global _generation
+    with _generation_lock:
+        _generation += 1
+
+
+def _cached_report(fn):
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        key = (fn.__name__, _generation, args, tuple(sorted(kwargs.items())))
+        result = _report_cache.get(key)
+        if result is None:
+            result = fn(*args, **kwargs)
+            _report_cache.set(key, result)
+        return result
+    return wrapper
+
+
 class ReportModel:
     @staticmethod
+    @_cached_report
     def get_sales_report(start_date=None, end_date=None, period='monthly'):
         """
         Generate sales report based on invoices.
@@ -11,12 +44,9 @@ class ReportModel:
         where_clauses = ["deleted_at IS NULL"]
         params = []
 
-        if start_date:
-            where_clauses.append("invoice_date >= %s")
-            params.append(start_date)
-        if end_date:
-            where_clauses.append("invoice_date <= %s")
-            params.append(end_date)
+        range_clauses, range_params = date_range_filter("invoice_date", start_date, end_date)
+        where_clauses.extend(range_clauses)
+        params.extend(range_params)
 
         where_sql = " WHERE " + " AND ".join(where_clauses)
 
@@ -71,6 +101,7 @@ class ReportModel:
         return DBManager.execute_query(query, tuple(params), fetch='all')
 
     @staticmethod
+    @_cached_report
     def get_payment_report(start_date=None, end_date=None, period='monthly'):
         """
         Generate payments report.
@@ -78,12 +109,9 @@ class ReportModel:
         where_clauses = []
         params = []
 
-        if start_date:
-            where_clauses.append("payment_date >= %s")
-            params.append(start_date)
-        if end_date:
-            where_clauses.append("payment_date <= %s")
-            params.append(end_date)
+        range_clauses, range_params = date_range_filter("payment_date", start_date, end_date)
+        where_clauses.extend(range_clauses)
+        params.extend(range_params)
 
         where_sql = " WHERE " + " AND ".join(where_clauses) if where_clauses else ""
 
@@ -109,6 +137,7 @@ class ReportModel:
         return DBManager.execute_query(query, tuple(params), fetch='all')
 
     @staticmethod
+    @_cached_report
     def get_customer_aging_report():
         """
         Generate customer aging report (who owes what).
@@ -136,6 +165,7 @@ class ReportModel:
         return DBManager.execute_query(query, fetch='all')
 
     @staticmethod
+    @_cached_report
     def get_top_products_report(start_date=None, end_date=None, limit=10):
         """
         Generate top selling products report.
@@ -143,12 +173,9 @@ class ReportModel:
         where_clauses = ["i.deleted_at IS NULL"]
         params = []
 
-        if start_date:
-            where_clauses.append("i.created_at >= %s")
-            params.append(start_date)
-        if end_date:
-            where_clauses.append("i.created_at <= %s")
-            params.append(end_date)
+        range_clauses, range_params = date_range_filter("i.created_at", start_date, end_date)
+        where_clauses.extend(range_clauses)
+        params.extend(range_params)
 
         where_sql = " WHERE " + " AND ".join(where_clauses)
 
@@ -170,6 +197,7 @@ class ReportModel:
         return DBManager.execute_query(query, tuple(params), fetch='all')
 
     @staticmethod
+    @_cached_report
     def get_summary_stats():
         """
         Get high-level summary stats.
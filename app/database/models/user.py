@@ -1,7 +1,14 @@
 
+import os
+from typing import Any, Dict, List, Optional
 from werkzeug.security import generate_password_hash, check_password_hash
 from .base_model import BaseModel
 from app.database.db_manager import DBManager
+from app.utils.ttl_cache import TTLCache
+
+# Users resolved for authenticated requests. Writers through this model invalidate
+# their entries; the short TTL bounds staleness for changes made by other workers.
+_user_cache = TTLCache(max_entries=1024, ttl_seconds=float(os.getenv("USER_CACHE_TTL_SECONDS", "30")))
 
 class User(BaseModel):
     _table_name = 'users'
@@ -109,6 +116,34 @@ class User(BaseModel):
         # Return the ID directly. The route will be responsible for fetching.
         return user_id
 
+    @classmethod
+    def find_by_id_cached(cls, user_id: str) -> Optional["User"]:
+        """find_by_id() for the JWT user loader, served from a short-lived cache."""
+        user = _user_cache.get(user_id)
+        if user is None:
+            user = cls.find_by_id(user_id)
+            if user:
+                _user_cache.set(user_id, user)
+        return user
+
+    @classmethod
+    def invalidate_cache(cls, *user_ids: str) -> None:
+        _user_cache.invalidate(*user_ids)
+
+    @classmethod
+    def update(cls, record_id: str, data: Dict[str, Any]) -> bool:
+        try:
+            return super().update(record_id, data)
+        finally:
+            cls.invalidate_cache(record_id)
+
+    @classmethod
+    def _bulk_update(cls, ids: List[str], set_fields: Dict[str, Any], condition_deleted: Optional[bool] = None) -> int:
+        try:
+            return super()._bulk_update(ids, set_fields, condition_deleted)
+        finally:
+            cls.invalidate_cache(*ids)
+
     @classmethod
     def find_by_email(cls, email, include_deleted=False):
         return cls.find_by_username_or_email(login_identifier=email, include_deleted=include_deleted)
@@ -133,8 +168,8 @@ class User(BaseModel):
         Admin role automatically has all permissions.
         """
         if self.role == 'admin':
-            from app.utils.permissions import PERMISSIONS
-            return list(PERMISSIONS.keys())
+            from app.utils.permissions import ALL_PERMISSIONS
+            return list(ALL_PERMISSIONS)
 
         if self.permissions:
             import json
@@ -151,7 +186,11 @@ class User(BaseModel):
 
     def has_permission(self, permission: str) -> bool:
         """Check if user has a specific permission"""
-        return permission in self.get_permissions()
+        if self.role == 'admin' or self.permissions:
+            return permission in self.get_permissions()
+
+        from app.database.models.permission_model import UserPermission
+        return permission in UserPermission.get_user_permissions_cached(str(self.id))
 
     @classmethod
     def has_created_entities(cls, user_id: str) -> bool:
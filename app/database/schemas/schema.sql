@@ -10,6 +10,7 @@ DROP TABLE IF EXISTS notification_settings;
 DROP TABLE IF EXISTS token_blacklist;
 DROP TABLE IF EXISTS payments;
 DROP TABLE IF EXISTS invoice_items;
+DROP TABLE IF EXISTS invoice_sequence;
 DROP TABLE IF EXISTS invoices;
 DROP TABLE IF EXISTS products;
 DROP TABLE IF EXISTS customers;
@@ -159,6 +160,15 @@ CREATE TABLE IF NOT EXISTS invoices (
   INDEX idx_invoices_deleted_at (deleted_at)
 );
 
+-- ------------------------------------------------------------------
+-- Table: invoice_sequence
+-- Purpose: Named counters used to number invoices without scanning them.
+-- ------------------------------------------------------------------
+CREATE TABLE IF NOT EXISTS invoice_sequence (
+  name VARCHAR(50) PRIMARY KEY,          -- Counter name, e.g. 'invoice_number'
+  value BIGINT UNSIGNED NOT NULL         -- Last value handed out
+);
+
 -- ------------------------------------------------------------------
 -- Table: invoice_items
 -- Purpose: Stores individual line items for each invoice.
@@ -269,3 +279,22 @@ CREATE TABLE IF NOT EXISTS notification_settings (
   -- Indexes for faster queries
   INDEX idx_notification_settings_user_id (user_id)
 );
+
+-- ------------------------------------------------------------------
+-- Additional indexes
+-- Kept as standalone statements so they are also added to databases created
+-- before they existed, and init_db skips the "duplicate key name" error on reruns.
+-- ------------------------------------------------------------------
+
+-- Covers SUM(amount) per invoice (payment totals / invoice status) without touching table rows
+CREATE INDEX idx_payments_invoice_amount ON payments (invoice_id, amount);
+
+-- Invoice list filters. InnoDB appends the primary key, so these also serve ORDER BY id DESC
+CREATE INDEX idx_invoices_deleted_status ON invoices (deleted_at, status);
+CREATE INDEX idx_invoices_deleted_customer ON invoices (deleted_at, customer_id);
+
+-- Date-range filters of the sales and top-products reports
+CREATE INDEX idx_invoices_created_at ON invoices (created_at);
+
+-- Payment search by method, newest first. Also serves method + payment_date range filters
+CREATE INDEX idx_payments_method_date ON payments (method, payment_date, id);
@@ -1,14 +1,30 @@
 from flask import Blueprint, request
 from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt_identity, get_jwt
+from werkzeug.security import check_password_hash, generate_password_hash
 from app.database.models.user import User
 from app.database.models.activity_model import ActivityLog
 from app.database.token_blocklist import BLOCKLIST
 from app.utils.auth import require_admin
 from app.utils.error_messages import ERROR_MESSAGES
 from app.utils.response import success_response, error_response
+from app.utils.rate_limit import FailedAttemptLimiter
 
 auth_blueprint = Blueprint('auth', __name__)
 
+# Error messages used by the handlers below
+_MSG_MISSING_CREDENTIALS = ERROR_MESSAGES["validation"]["missing_credentials"]
+_MSG_INVALID_CREDENTIALS = ERROR_MESSAGES["auth"]["invalid_credentials"]
+_MSG_TOO_MANY_ATTEMPTS = ERROR_MESSAGES["auth"]["too_many_attempts"]
+_MSG_EMPTY_BODY = ERROR_MESSAGES["validation"]["request_body_empty"]
+_MSG_USER_EXISTS = ERROR_MESSAGES["conflict"]["user_exists"]
+_MSG_SERVER_CREATE_USER = ERROR_MESSAGES["server_error"]["create_user"]
+
+# At most 5 failed sign-ins per client IP per minute, checked before any password hashing
+sign_in_limiter = FailedAttemptLimiter(max_attempts=5, window_seconds=60)
+
+# Hash checked when the account does not exist, so unknown and known users cost the same
+_DUMMY_PASSWORD_HASH = generate_password_hash('dummy-password', method='scrypt')
+
 @auth_blueprint.route('/sign-in', methods=['POST'])
 def sign_in():
     """
@@ -16,7 +32,7 @@ def sign_in():
     Accepts: email/password, username/password, or identifier/password
     """
     data = request.get_json()
-    if not data:
+    if not data or not isinstance(data, dict):
         return error_response(error_code='validation_error', message="Request body cannot be empty.", status=400)
 
     # Support multiple login formats: email, username, or identifier (backward compatible)
@@ -24,11 +40,18 @@ def sign_in():
     password = data.get('password')
 
     if not login_identifier or not password:
-        return error_response(error_code='validation_error', message=ERROR_MESSAGES["validation"]["missing_credentials"], status=400)
+        return error_response(error_code='validation_error', message=_MSG_MISSING_CREDENTIALS, status=400)
+
+    client_ip = request.remote_addr or 'unknown'
+    if sign_in_limiter.is_blocked(client_ip):
+        return error_response(error_code='too_many_requests', message=_MSG_TOO_MANY_ATTEMPTS, status=429)
 
     user = User.find_by_username_or_email(login_identifier)
 
-    if user and user.check_password(password):
+    if user is None:
+        check_password_hash(_DUMMY_PASSWORD_HASH, password)
+    elif user.check_password(password):
+        sign_in_limiter.reset(client_ip)
         additional_claims = {"role": user.role}
         access_token = create_access_token(identity=str(user.id), additional_claims=additional_claims)
         refresh_token = create_refresh_token(identity=str(user.id), additional_claims=additional_claims)
@@ -53,7 +76,8 @@ def sign_in():
             'user': user_dict
         }, message="Authentication successful.")
 
-    return error_response(error_code='invalid_credentials', message=ERROR_MESSAGES["auth"]["invalid_credentials"], status=401)
+    sign_in_limiter.record_failure(client_ip)
+    return error_response(error_code='invalid_credentials', message=_MSG_INVALID_CREDENTIALS, status=401)
 
 @auth_blueprint.route('/sign-out', methods=['POST'])
 @jwt_required()
@@ -132,7 +156,7 @@ def register():
     """
     data = request.get_json()
     if not data:
-        return error_response(error_code='validation_error', message=ERROR_MESSAGES["validation"]["request_body_empty"], status=400)
+        return error_response(error_code='validation_error', message=_MSG_EMPTY_BODY, status=400)
 
     required_fields = ['username', 'email', 'password', 'name', 'company_name', 'company_address', 'company_city', 'company_phone', 'company_email', 'company_gst']
     missing_fields = [field for field in required_fields if field not in data]
@@ -144,7 +168,7 @@ def register():
         return error_response(error_code='validation_error', message="Invalid role provided.", status=400)
 
     if User.find_by_email(data['email']):
-        return error_response(error_code='conflict', message=ERROR_MESSAGES["conflict"]["user_exists"], status=409)
+        return error_response(error_code='conflict', message=_MSG_USER_EXISTS, status=409)
 
     try:
         user_id = User.create(data)
@@ -162,6 +186,6 @@ def register():
                 'permissions': new_user.get_permissions()
             }
             return success_response(user_data, message="User registered successfully.", status=201)
-        return error_response(error_code='server_error', message=ERROR_MESSAGES["server_error"]["create_user"], status=500)
+        return error_response(error_code='server_error', message=_MSG_SERVER_CREATE_USER, status=500)
     except Exception as e:
-        return error_response(error_code='server_error', message=ERROR_MESSAGES["server_error"]["create_user"], details=str(e), status=500)
+        return error_response(error_code='server_error', message=_MSG_SERVER_CREATE_USER, details=str(e), status=500)
@@ -5,26 +5,29 @@ from marshmallow import ValidationError
 
 from app.database.models.customer import Customer
 from app.schemas.customer_schema import (
-    CustomerSchema,
-    CustomerSummarySchema,
-    CustomerDetailSchema,
-    CustomerUpdateSchema,
+    customer_schema,
+    customer_summary_schema,
+    customer_detail_schema,
+    customer_update_schema,
+    dump_customer_summary,
 )
-from app.utils.response import success_response, error_response
+from app.utils.response import success_response, success_response_streaming, error_response
 from app.utils.error_messages import ERROR_MESSAGES
 from app.utils.auth import require_admin, require_permission
 from app.utils.pagination import get_pagination
-from app.utils.helpers import validate_request, bulk_action_handler
+from app.utils.helpers import validate_request, bulk_action_handler, sanitize_bulk_ids, MAX_BULK_IDS
+from app.utils.args import qbool
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.database.models.activity_model import ActivityLog
 
 customers_blueprint = Blueprint('customers', __name__)
 
-# Schemas
-customer_schema = CustomerSchema()
-customer_summary_schema = CustomerSummarySchema()
-customer_detail_schema = CustomerDetailSchema()
-customer_update_schema = CustomerUpdateSchema()
+# Error messages used by the handlers below
+_MSG_EMPTY_BODY = ERROR_MESSAGES["validation"]["request_body_empty"]
+_MSG_SERVER_CREATE = ERROR_MESSAGES["server_error"]["create_customer"]
+_MSG_SERVER_FETCH = ERROR_MESSAGES["server_error"]["fetch_customer"]
+_MSG_CUSTOMER_NOT_FOUND = ERROR_MESSAGES["not_found"]["customer"]
+_MSG_SERVER_UPDATE = ERROR_MESSAGES["server_error"]["update_customer"]
 
 
 
@@ -42,24 +45,24 @@ def get_existing_customer_by_email(email: str):
 def create_customer():
     data = request.get_json() or {}
     if not data:
-        return error_response('validation_error', ERROR_MESSAGES["validation"]["request_body_empty"], 400)
+        return error_response('validation_error', _MSG_EMPTY_BODY, 400)
 
     try:
         validated_data: Dict[str, Any] = validate_request(customer_schema, data)
 
-        if 'email' in validated_data and validated_data['email']:
+        customer_id = Customer.create_customer(validated_data)
+        if customer_id is None:
+            # Email UNIQUE violation: tell an active duplicate from a soft-deleted one
             existing = get_existing_customer_by_email(validated_data['email'])
-            if existing:
-                if existing.deleted_at is None:
-                    return error_response(error_code='conflict', message='A customer with this email address already exists.', status=409)
+            if existing and existing.deleted_at is not None:
                 return error_response(
                     error_code='conflict_soft_deleted',
                     message='A customer with this email was previously deleted. Do you want to restore them?',
                     details={'email': existing.email},
                     status=409
                 )
+            return error_response(error_code='conflict', message='A customer with this email address already exists.', status=409)
 
-        customer_id = Customer.create(validated_data)
         customer = Customer.find_by_id_with_aggregates(customer_id)
 
         # Log activity
@@ -78,7 +81,7 @@ def create_customer():
         return error_response('validation_error', "Invalid data.", details=err.args[0], status=400)
     except Exception as e:
         return error_response(error_code='server_error',
-                              message=ERROR_MESSAGES["server_error"]["create_customer"],
+                              message=_MSG_SERVER_CREATE,
                               details=str(e),
                               status=500)
 
@@ -91,7 +94,7 @@ def get_customers():
     page, per_page = get_pagination()
     q = request.args.get('q')
     status = request.args.get('status')
-    deleted = request.args.get('deleted', 'false').lower() == 'true'
+    deleted = qbool('deleted')
 
     try:
         customers, total = Customer.list_all(
@@ -102,13 +105,14 @@ def get_customers():
             deleted_only=deleted
         )
         message = "Deleted customers retrieved successfully" if deleted else "Customers retrieved successfully"
-        return success_response(
-            customer_summary_schema.dump(customers, many=True),
+        return success_response_streaming(
+            customers,
+            dump_customer_summary,
             message,
             meta={'total': total, 'page': page, 'per_page': per_page}
         )
     except Exception as e:
-        return error_response('server_error', ERROR_MESSAGES["server_error"]["fetch_customer"], details=str(e), status=500)
+        return error_response('server_error', _MSG_SERVER_FETCH, details=str(e), status=500)
 
 
 # ---------------- Get Single Customer ----------------
@@ -116,14 +120,14 @@ def get_customers():
 @jwt_required()
 @require_permission('customers.view')
 def get_customer(customer_id: str):
-    include_deleted = request.args.get('include_deleted', 'false').lower() == 'true'
+    include_deleted = qbool('include_deleted')
     try:
         customer = Customer.find_by_id_with_aggregates(customer_id, include_deleted=include_deleted)
         if not customer:
-            return error_response('not_found', ERROR_MESSAGES["not_found"]["customer"], 404)
+            return error_response('not_found', _MSG_CUSTOMER_NOT_FOUND, 404)
         return success_response(customer_detail_schema.dump(customer), "Customer details fetched successfully")
     except Exception as e:
-        return error_response('server_error', ERROR_MESSAGES["server_error"]["fetch_customer"], details=str(e), status=500)
+        return error_response('server_error', _MSG_SERVER_FETCH, details=str(e), status=500)
 
 
 # ---------------- Update Customer ----------------
@@ -133,13 +137,10 @@ def get_customer(customer_id: str):
 def update_customer(customer_id: str):
     data = request.get_json() or {}
     if not data:
-        return error_response('validation_error', ERROR_MESSAGES["validation"]["request_body_empty"], 400)
+        return error_response('validation_error', _MSG_EMPTY_BODY, 400)
 
     try:
         validated_data: Dict[str, Any] = validate_request(customer_update_schema, data)
-        customer_to_update = Customer.find_by_id(customer_id)
-        if not customer_to_update:
-            return error_response('not_found', ERROR_MESSAGES["not_found"]["customer"], 404)
 
         # Check email conflicts
         if 'email' in validated_data and validated_data['email']:
@@ -154,7 +155,8 @@ def update_customer(customer_id: str):
                     409
                 )
 
-        Customer.update_customer(customer_id, validated_data)
+        if not Customer.update_customer(customer_id, validated_data):
+            return error_response('not_found', _MSG_CUSTOMER_NOT_FOUND, 404)
         updated_customer = Customer.find_by_id_with_aggregates(customer_id)
 
         # Log activity
@@ -172,7 +174,7 @@ def update_customer(customer_id: str):
     except ValueError as err:
         return error_response('validation_error', "Invalid data.", details=err.args[0], status=400)
     except Exception as e:
-        return error_response('server_error', ERROR_MESSAGES["server_error"]["update_customer"], details=str(e), status=500)
+        return error_response('server_error', _MSG_SERVER_UPDATE, details=str(e), status=500)
 
 
 # ---------------- Restore Customer ----------------
@@ -185,6 +187,12 @@ def restore_customer():
 
     if not ids_to_restore or not isinstance(ids_to_restore, list):
         return error_response('validation_error', "Invalid request. 'ids' must be a list.", 400)
+    if len(ids_to_restore) > MAX_BULK_IDS:
+        return error_response('validation_error', f"Invalid request. At most {MAX_BULK_IDS} ids are allowed per request.", 400)
+
+    ids_to_restore = sanitize_bulk_ids(ids_to_restore)
+    if not ids_to_restore:
+        return error_response('validation_error', "Invalid request. 'ids' must contain valid customer IDs.", 400)
 
     result = bulk_action_handler(ids_to_restore, Customer.bulk_restore, "{count} customer(s) restored successfully.", "No matching customers found for the provided IDs.")
 
@@ -212,6 +220,12 @@ def bulk_delete_customers():
 
     if not ids_to_delete or not isinstance(ids_to_delete, list):
         return error_response('validation_error', "Invalid request. 'ids' must be a list.", 400)
+    if len(ids_to_delete) > MAX_BULK_IDS:
+        return error_response('validation_error', f"Invalid request. At most {MAX_BULK_IDS} ids are allowed per request.", 400)
+
+    ids_to_delete = sanitize_bulk_ids(ids_to_delete)
+    if not ids_to_delete:
+        return error_response('validation_error', "Invalid request. 'ids' must contain valid customer IDs.", 400)
 
     result = bulk_action_handler(ids_to_delete, Customer.bulk_soft_delete, "{count} customer(s) soft-deleted successfully.", "No matching customers found for the provided IDs.")
 
@@ -23,15 +23,12 @@ def dashboard_stats_route():
       - Latest invoices (with customer info)
     Accessible only by authenticated admin users.
     """
+    # get_dashboard_stats() builds a fresh dict per call, so extend it in place
     stats = get_dashboard_stats()
-    sales = get_sales_performance()
-    invoices = get_latest_invoices()
+    stats["sales_performance"] = get_sales_performance()
+    stats["invoices"] = get_latest_invoices()
 
     return success_response(
-        result={
-            **stats,
-            "sales_performance": sales,
-            "invoices": invoices,
-        },
+        result=stats,
         message="Dashboard data retrieved successfully."
     )
@@ -1,27 +1,32 @@
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from hashlib import blake2b
+from io import BytesIO
 from typing import Any, Dict, List
-from flask import Blueprint, request
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from marshmallow import ValidationError
-from decimal import Decimal
-from datetime import date
+from flask import Blueprint, current_app, request, send_file
+from flask_jwt_extended import jwt_required, get_jwt_identity, get_current_user
+from datetime import date, datetime, timezone
 
+from app.database.db_manager import DBManager
 from app.database.models.customer import Customer
 from app.database.models.invoice import Invoice
 from app.database.models.invoice_item_model import InvoiceItem
 from app.database.models.payment import Payment
-from app.database.models.payment import Payment
 from app.database.models.product import Product
-from app.database.models.user import User
-from app.schemas.invoice_schema import invoice_schema
+from app.database.models.report_model import invalidate_report_cache
+from app.schemas.invoice_schema import invoice_schema, invoice_update_schema
 from app.utils.error_messages import ERROR_MESSAGES
 from app.utils.auth import require_admin, require_permission
 from app.utils.response import success_response, error_response
-from app.utils.pagination import get_pagination
-from app.utils.utils import calculate_invoice_totals, generate_invoice_number, update_invoice_status
+from app.utils.pagination import get_pagination, get_cursor, encode_cursor
+from app.utils.utils import calculate_invoice_totals, calculate_totals_from_subtotal, generate_invoice_number, update_invoice_status, to_decimal, DECIMAL_ZERO
 from app.utils.pdf_generator import InvoicePDFGenerator
+from app.utils.pdf_cache import invoice_pdf_cache, invoice_pdf_renderer, PDF_SYNC_WAIT_SECONDS
+from app.utils.json_provider import dumps_bytes
 from app.utils.helpers import validate_request, get_or_404, bulk_action_handler
+from app.utils.args import qbool
 from app.database.models.activity_model import ActivityLog
 from app.services.email_service import email_service
+from app.services.phonepe_service import phonepe_service
 
 
 invoices_blueprint = Blueprint('invoices', __name__)
@@ -34,7 +39,7 @@ invoices_blueprint = Blueprint('invoices', __name__)
 def list_invoices():
     try:
         page, per_page = get_pagination()
-        deleted = request.args.get('deleted', 'false').lower() == 'true'
+        deleted = qbool('deleted')
         filters = {
             'status': request.args.get('status'),
             'customer_id': request.args.get('customer_id'),
@@ -42,19 +47,22 @@ def list_invoices():
         }
 
         offset = (page - 1) * per_page
+        after_id = get_cursor()
         invoices, total = Invoice.list_all(
             customer_id=filters['customer_id'],
             status=filters['status'],
             q=filters['q'],
             offset=offset,
             limit=per_page,
-            deleted_only=deleted
+            deleted_only=deleted,
+            after_id=after_id
         )
 
+        next_cursor = encode_cursor(invoices[-1].id) if len(invoices) == per_page else None
         message = "Deleted invoices retrieved successfully" if deleted else "Invoices retrieved successfully"
         return success_response(
-            result = [inv.to_dict() for inv in invoices if inv is not None],
-            meta={'total': total, 'page': page, 'per_page': per_page},
+            result = Invoice.to_dict_list(invoices),
+            meta={'total': total, 'page': page, 'per_page': per_page, 'next_cursor': next_cursor},
             message=message,
             status=200
         )
@@ -68,19 +76,15 @@ def list_invoices():
 @require_permission('invoices.view')
 def get_invoice(invoice_id):
     try:
-        invoice = Invoice.find_by_id(invoice_id)
+        invoice = Invoice.find_with_details(invoice_id)
         if not invoice:
             return error_response('not_found', ERROR_MESSAGES["not_found"]["invoice"], status=404)
 
-        customer = Customer.find_by_id(invoice.customer_id)
-        items = InvoiceItem.find_by_invoice_id(invoice_id)
-        payment = Payment.find_latest_by_invoice_id(invoice_id)
-
         invoice_data = {
             **invoice.to_dict(),
-            'customer': customer.to_dict() if customer else None,
-            'items': [i.to_dict() for i in items if i is not None],
-            'payment': payment.to_dict() if payment else None
+            'customer': invoice.customer.to_dict() if invoice.customer else None,
+            'items': [i.to_dict() for i in invoice.items],
+            'payment': invoice.latest_payment.to_dict() if invoice.latest_payment else None
         }
 
         return success_response(result=invoice_data, status=200)
@@ -107,72 +111,83 @@ def create_invoice():
         if not customer:
             return error_response('not_found', ERROR_MESSAGES["not_found"]["customer"], 404)
 
-        # Prepare product data
-        items = []
-        for item in validated['items']:
-            product = Product.find_by_id(item['product_id'])
-            if not product:
-                return error_response('not_found', f"Product ID {item['product_id']} not found.", 404)
-            items.append({'price': product.price, **item})
-
-        discount = Decimal(validated.get('discount_amount', '0.00'))
-        tax_percent = Decimal(validated.get('tax_percent', '0.00'))
-        subtotal, tax, total = calculate_invoice_totals(items, discount, tax_percent)
+        # Invoice, items, stock and initial payment commit together; product rows
+        # stay locked until then so concurrent invoices cannot oversell stock.
+        with DBManager.transaction():
+            # Prepare product data
+            products = Product.find_by_ids([item['product_id'] for item in validated['items']], for_update=True)
+            items = []
+            for item in validated['items']:
+                product = products.get(item['product_id'])
+                if not product:
+                    return error_response('not_found', f"Product ID {item['product_id']} not found.", 404)
+                items.append({'price': product.price, **item})
+
+            discount = validated.get('discount_amount') or DECIMAL_ZERO
+            tax_percent = validated.get('tax_percent') or DECIMAL_ZERO
+            subtotal, tax, total = calculate_invoice_totals(items, discount, tax_percent)
+
+            invoice_data = {
+                'customer_id': validated['customer_id'],
+                'user_id': get_jwt_identity(),
+                'invoice_number': generate_invoice_number(customer.id),
+                'due_date': validated.get('due_date'),
+                'subtotal_amount': subtotal,
+                'discount_amount': discount,
+                'tax_percent': tax_percent,
+                'tax_amount': tax,
+                'total_amount': total,
+                'status': 'Pending',
+                # Set here rather than by the DB so the response can be built without re-reading the row
+                'created_at': datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+            }
+
+            # Handle initial payment
+            initial_payment = validated.get('initial_payment')
+            if initial_payment:
+                pay_amount = initial_payment['amount']
+                if pay_amount >= total:
+                    invoice_data['status'] = 'Paid'
+                elif pay_amount > 0:
+                    invoice_data['status'] = 'Partially Paid'
+
+            # Create invoice
+            invoice_id = Invoice.create_invoice(invoice_data)
+            if not invoice_id:
+                return error_response('server_error', "Invoice creation failed.", 500)
+
+            # Create invoice items & update stock
+            items_data = [
+                {
+                    'invoice_id': invoice_id,
+                    'product_id': i['product_id'],
+                    'quantity': i['quantity'],
+                    'price': i['price'],
+                    'total': i['price'] * i['quantity']
+                }
+                for i in items
+            ]
+            stock_changes: Dict[str, int] = {}
+            for i in items:
+                stock_changes[i['product_id']] = stock_changes.get(i['product_id'], 0) - i['quantity']
 
-        invoice_data = {
-            'customer_id': validated['customer_id'],
-            'user_id': get_jwt_identity(),
-            'invoice_number': generate_invoice_number(customer.id),
-            'due_date': validated.get('due_date'),
-            'subtotal_amount': subtotal,
-            'discount_amount': discount,
-            'tax_percent': tax_percent,
-            'tax_amount': tax,
-            'total_amount': total,
-            'status': 'Pending'
-        }
+            Product.bulk_adjust_stock(stock_changes)
+            InvoiceItem.bulk_create(items_data)
 
-        # Handle initial payment
-        initial_payment = validated.get('initial_payment')
-        if initial_payment:
-            pay_amount = Decimal(initial_payment['amount'])
-            if pay_amount >= total:
-                invoice_data['status'] = 'Paid'
-            elif pay_amount > 0:
-                invoice_data['status'] = 'Partially Paid'
-
-        # Create invoice
-        invoice_id = Invoice.create_invoice(invoice_data)
-        if not invoice_id:
-            return error_response('server_error', "Invoice creation failed.", 500)
-
-        # Create invoice items & update stock
-        items_data = []
-        for i in items:
-            items_data.append({
-                'invoice_id': invoice_id,
-                'product_id': i['product_id'],
-                'quantity': int(i['quantity']),
-                'price': Decimal(i['price']),
-                'total': Decimal(i['price']) * int(i['quantity'])
-            })
-            Product.update_product(i['product_id'], {"stock_change": -i['quantity']})
-
-        InvoiceItem.bulk_create(items_data)
-
-        # Record initial payment
-        if initial_payment:
-            Payment.record_payment({
-                'invoice_id': invoice_id,
-                'amount': Decimal(initial_payment['amount']),
-                'payment_date': date.today(),
-                'method': initial_payment['method'],
-                'reference_no': initial_payment.get('reference_no')
-            })
+            # Record initial payment
+            if initial_payment:
+                Payment.record_payment({
+                    'invoice_id': invoice_id,
+                    'amount': initial_payment['amount'],
+                    'payment_date': date.today(),
+                    'method': initial_payment['method'],
+                    'reference_no': initial_payment.get('reference_no')
+                })
 
-        created_invoice = Invoice.find_by_id(invoice_id)
-        if not created_invoice:
-            return error_response('not_found', 'Created invoice not found.', 404)
+        invalidate_report_cache()
+        created_invoice = Invoice.from_created(
+            invoice_data, initial_payment['amount'] if initial_payment else DECIMAL_ZERO
+        )
 
         # Log activity
         ActivityLog.create_log(
@@ -186,34 +201,27 @@ def create_invoice():
 
         # Send email notification (don't fail invoice creation if email fails)
         try:
-            # Fetch invoice items for email
             invoice_dict = created_invoice.to_dict()
-            invoice_items = InvoiceItem.find_by_invoice_id(invoice_id)
-
-            # Format items for email template
-            formatted_items = []
-            for item in invoice_items:
-                item_dict = item.to_dict()
-                # Flatten product details for easier template access
-                formatted_items.append({
-                    'product_name': item_dict.get('product', {}).get('name', 'Product'),
-                    'quantity': item_dict['quantity'],
-                    'price': item_dict['price'],
-                    'total': item_dict['total']
-                })
 
-            invoice_dict['invoice_items'] = formatted_items
+            # Format items for email template from the rows just inserted
+            invoice_dict['invoice_items'] = [
+                {
+                    'product_name': products[d['product_id']].name,
+                    'quantity': d['quantity'],
+                    'price': float(d['price']),
+                    'total': float(d['total'])
+                }
+                for d in items_data
+            ]
 
             # Add initial payment details if available
+            # (amount_paid / due_amount already include it, see Invoice.from_created)
             if initial_payment:
                 invoice_dict['initial_payment'] = {
-                    'amount': float(initial_payment['amount']),
+                    'amount': invoice_dict['amount_paid'],
                     'method': initial_payment['method'],
                     'date': date.today().isoformat()
                 }
-                # Update amount paid and due amount for the email
-                invoice_dict['amount_paid'] = float(initial_payment['amount'])
-                invoice_dict['due_amount'] = invoice_dict['total_amount'] - invoice_dict['amount_paid']
 
             email_service.send_invoice_created_email(invoice_dict, customer)
         except Exception as email_error:
@@ -229,6 +237,24 @@ def create_invoice():
         return error_response('server_error', 'Error creating invoice.', str(e), 500)
 
 
+def _updated_invoice_response(invoice_id: str):
+    """Full invoice representation (customer, items, payments) returned by update_invoice."""
+    updated_invoice = Invoice.find_with_details(invoice_id)
+    if not updated_invoice:
+        return error_response('not_found', ERROR_MESSAGES["not_found"]["invoice"], 404)
+
+    payments = Payment.to_dict_list(Payment.find_by_invoice_id(invoice_id))
+
+    result = {
+        **updated_invoice.to_dict(),
+        'customer': updated_invoice.customer.to_dict() if updated_invoice.customer else None,
+        'items': [i.to_dict() for i in updated_invoice.items],
+        'payments': payments
+    }
+
+    return success_response(result=result, status=200)
+
+
 @invoices_blueprint.route('/invoices/<string:invoice_id>', methods=['PUT'])
 @jwt_required()
 @require_permission('invoices.update')
@@ -242,107 +268,15 @@ def update_invoice(invoice_id: str):
         return error_response('not_found', ERROR_MESSAGES["not_found"]["invoice"], 404)
 
     try:
-        validated: Dict[str, Any] = invoice_schema.load(data, partial=True)
-    except ValidationError as err:
-        return error_response('validation_error', 'Invalid data provided.', err.messages, 400)
+        validated: Dict[str, Any] = validate_request(invoice_update_schema, partial=True)
+    except ValueError as err:
+        return error_response('validation_error', 'Invalid data provided.', err.args[0], 400)
 
     try:
-        # --- Handle item updates ---
-        if 'items' in validated:
-            old_items = {i.product_id: i.quantity for i in InvoiceItem.find_by_invoice_id(invoice_id) if i is not None}
-            new_items = {i['product_id']: i['quantity'] for i in validated['items']}
-            all_pids = set(old_items) | set(new_items)
-
-            # Adjust stock differences
-            for pid in all_pids:
-                stock_change = old_items.get(pid, 0) - new_items.get(pid, 0)
-                Product.update_product(pid, {"stock_change": stock_change})
-
-            # Replace invoice items
-            InvoiceItem.delete_by_invoice_id(invoice_id)
-            items_data = []
-            for i in validated['items']:
-                product = Product.find_by_id(i['product_id'])
-                if not product:
-                    return error_response('not_found', f"Product ID {i['product_id']} not found.", 404)
-                items_data.append({
-                    'invoice_id': invoice_id,
-                    'product_id': i['product_id'],
-                    'quantity': int(i['quantity']),
-                    'price': Decimal(product.price),
-                    'total': Decimal(product.price) * int(i['quantity'])
-                })
-            InvoiceItem.bulk_create(items_data)
-
-        # --- Recalculate totals if needed ---
-        if {'items', 'discount_amount', 'tax_percent'} & validated.keys():
-            current_items = InvoiceItem.find_by_invoice_id(invoice_id)
-            items_data = [{'price': i.price, 'quantity': i.quantity} for i in current_items if i is not None]
-            subtotal, tax, total = calculate_invoice_totals(
-                items_data,
-                Decimal(validated.get('discount_amount', invoice.discount_amount)),
-                Decimal(validated.get('tax_percent', invoice.tax_percent))
-            )
-            validated.update({
-                'subtotal_amount': subtotal,
-                'tax_amount': tax,
-                'total_amount': total
-            })
-        else:
-            total = Decimal(invoice.total_amount)
-
-        # --- Handle "Mark as Paid" ---
-        if validated.get('is_mark_as_paid'):
-            # Calculate amount to pay
-            total_amount = Decimal(invoice.total_amount)
-            # If items were updated, use the new total
-            if 'total_amount' in validated:
-                total_amount = validated['total_amount']
-
-            # Get already paid amount
-            paid_amount = Payment.get_total_paid(invoice_id)
-            remaining_balance = total_amount - paid_amount
-
-            # When marking as paid, strictly pay the remaining balance
-            # Ignore amount_paid from request as it might be the full total
-            payment_amount = remaining_balance
-
-            if payment_amount > 0:
-                Payment.record_payment({
-                    'invoice_id': invoice_id,
-                    'amount': Decimal(str(payment_amount)),
-                    'payment_date': date.today(),
-                    'method': 'cash', # Default to cash if not specified
-                    'reference_no': f'Marked as paid via API'
-                })
-
-                # Log activity
-                ActivityLog.create_log(
-                    user_id=get_jwt_identity(),
-                    action='PAYMENT_RECORDED',
-                    entity_type='invoice',
-                    entity_id=invoice_id,
-                    details={'amount': float(payment_amount), 'method': 'cash'},
-                    ip_address=request.remote_addr
-                )
-
-                # Send email notification
-                payment_data = {
-                    'amount': float(payment_amount),
-                    'payment_date': date.today().isoformat(),
-                    'method': 'cash',
-                    'reference_no': f'Marked as paid via API'
-                }
-
-                invoice_dict = invoice.to_dict()
-                invoice_dict['amount_paid'] = float(paid_amount + payment_amount)
-                invoice_dict['due_amount'] = 0.0 # Since we are paying the full remaining balance
-                invoice_dict['status'] = 'Paid'
-
-                # Fetch customer for email
-                customer = Customer.find_by_id(invoice.customer_id)
-                if customer:
-                    email_service.send_payment_received_email(payment_data, invoice_dict, customer)
+        # Nothing to write (e.g. only amount_paid without is_mark_as_paid): skip the
+        # transaction, status recompute and activity log and return the invoice as is.
+        if not (validated.keys() - {'amount_paid', 'is_mark_as_paid'}) and not validated.get('is_mark_as_paid'):
+            return _updated_invoice_response(invoice_id)
 
         # --- Log activity before modifying validated dict ---
         # Prepare activity details
@@ -364,16 +298,138 @@ def update_invoice(invoice_id: str):
             if key not in ['items', 'is_mark_as_paid', 'amount_paid', 'subtotal_amount', 'tax_amount', 'total_amount']:
                 activity_details[key] = validated[key]
 
-        # --- Update invoice and status ---
-        # Remove non-model fields
-        validated.pop('items', None)
-        validated.pop('is_mark_as_paid', None)
-        validated.pop('amount_paid', None)
+        # Items, stock, totals and any "Mark as Paid" payment commit together
+        payment_amount = DECIMAL_ZERO
+        paid_amount = None
+        new_items_data = None
+        with DBManager.transaction():
+            # --- Handle item updates ---
+            if 'items' in validated:
+                products = Product.find_by_ids([i['product_id'] for i in validated['items']], for_update=True)
+                for i in validated['items']:
+                    if i['product_id'] not in products:
+                        return error_response('not_found', f"Product ID {i['product_id']} not found.", 404)
+
+                current_items = InvoiceItem.find_by_invoice_id(invoice_id)
+                unchanged = sorted((i.product_id, i.quantity, to_decimal(i.price)) for i in current_items) == sorted(
+                    (i['product_id'], i['quantity'], products[i['product_id']].price) for i in validated['items']
+                )
+
+                if unchanged:
+                    # Same products, quantities and prices: nothing to replace, stock stays as is
+                    validated.pop('items')
+                else:
+                    old_items = {i.product_id: i.quantity for i in current_items}
+                    new_items = {i['product_id']: i['quantity'] for i in validated['items']}
+                    all_pids = set(old_items) | set(new_items)
+
+                    # Adjust stock differences
+                    Product.bulk_adjust_stock({pid: old_items.get(pid, 0) - new_items.get(pid, 0) for pid in all_pids})
+
+                    # Replace invoice items
+                    InvoiceItem.delete_by_invoice_id(invoice_id)
+                    items_data = []
+                    for i in validated['items']:
+                        price, quantity = products[i['product_id']].price, i['quantity']
+                        items_data.append({
+                            'invoice_id': invoice_id,
+                            'product_id': i['product_id'],
+                            'quantity': quantity,
+                            'price': price,
+                            'total': price * quantity
+                        })
+                    InvoiceItem.bulk_create(items_data)
+                    new_items_data = items_data
+
+            # --- Recalculate totals if needed ---
+            if {'items', 'discount_amount', 'tax_percent'} & validated.keys():
+                # Subtotal comes from the items just written, or the stored one if items are unchanged
+                subtotal = to_decimal(invoice.subtotal_amount) if new_items_data is None else sum(
+                    (i['total'] for i in new_items_data), DECIMAL_ZERO
+                )
+                subtotal, tax, total = calculate_totals_from_subtotal(
+                    subtotal,
+                    to_decimal(invoice.discount_amount if validated.get('discount_amount') is None else validated['discount_amount']),
+                    to_decimal(invoice.tax_percent if validated.get('tax_percent') is None else validated['tax_percent'])
+                )
+                validated.update({
+                    'subtotal_amount': subtotal,
+                    'tax_amount': tax,
+                    'total_amount': total
+                })
+            else:
+                total = to_decimal(invoice.total_amount)
+
+            # --- Handle "Mark as Paid" ---
+            if validated.get('is_mark_as_paid'):
+                # Calculate amount to pay
+                total_amount = to_decimal(invoice.total_amount)
+                # If items were updated, use the new total
+                if 'total_amount' in validated:
+                    total_amount = validated['total_amount']
+
+                # Get already paid amount
+                paid_amount = Payment.get_total_paid(invoice_id)
+                remaining_balance = total_amount - paid_amount
+
+                # When marking as paid, strictly pay the remaining balance
+                # Ignore amount_paid from request as it might be the full total
+                payment_amount = remaining_balance
+
+                if payment_amount > 0:
+                    paid_amount += payment_amount
+                    Payment.record_payment({
+                        'invoice_id': invoice_id,
+                        'amount': payment_amount,
+                        'payment_date': date.today(),
+                        'method': 'cash', # Default to cash if not specified
+                        'reference_no': f'Marked as paid via API'
+                    })
+
+            # --- Update invoice and status ---
+            # Remove non-model fields
+            validated.pop('items', None)
+            validated.pop('is_mark_as_paid', None)
+            validated.pop('amount_paid', None)
+
+            if validated:
+                Invoice.update(invoice_id, validated)
+
+            # Status only depends on the total, payments and an explicit status write
+            if 'total_amount' in validated or payment_amount > 0 or 'status' in validated:
+                update_invoice_status(
+                    invoice_id, total, current_status=validated.get('status', invoice.status), total_paid=paid_amount
+                )
+
+        invalidate_report_cache()
+        if payment_amount > 0:
+            # Log activity
+            ActivityLog.create_log(
+                user_id=get_jwt_identity(),
+                action='PAYMENT_RECORDED',
+                entity_type='invoice',
+                entity_id=invoice_id,
+                details={'amount': float(payment_amount), 'method': 'cash'},
+                ip_address=request.remote_addr
+            )
+
+            # Send email notification
+            payment_data = {
+                'amount': float(payment_amount),
+                'payment_date': date.today().isoformat(),
+                'method': 'cash',
+                'reference_no': f'Marked as paid via API'
+            }
 
-        if validated:
-            Invoice.update(invoice_id, validated)
+            invoice_dict = invoice.to_dict()
+            invoice_dict['amount_paid'] = float(paid_amount)
+            invoice_dict['due_amount'] = 0.0 # Since we are paying the full remaining balance
+            invoice_dict['status'] = 'Paid'
 
-        update_invoice_status(invoice_id, total)
+            # Fetch customer for email
+            customer = Customer.find_by_id_cached(invoice.customer_id)
+            if customer:
+                email_service.send_payment_received_email(payment_data, invoice_dict, customer)
 
         # Log activity
         ActivityLog.create_log(
@@ -386,24 +442,7 @@ def update_invoice(invoice_id: str):
         )
 
         # --- Fetch updated data safely ---
-        updated_invoice = Invoice.find_by_id(invoice_id)
-        if not updated_invoice:
-            return error_response('not_found', ERROR_MESSAGES["not_found"]["invoice"], 404)
-
-        customer = Customer.find_by_id(updated_invoice.customer_id)
-        customer_data = customer.to_dict() if customer else None
-
-        items = [i.to_dict() for i in InvoiceItem.find_by_invoice_id(invoice_id) if i is not None]
-        payments = [p.to_dict() for p in Payment.find_by_invoice_id(invoice_id) if p is not None]
-
-        result = {
-            **updated_invoice.to_dict(),
-            'customer': customer_data,
-            'items': items,
-            'payments': payments
-        }
-
-        return success_response(result=result, status=200)
+        return _updated_invoice_response(invoice_id)
 
     except Exception as e:
         return error_response('server_error', 'Error updating invoice.', str(e), 500)
@@ -424,6 +463,7 @@ def restore_invoices():
 
     # Log activity
     if result[1] == 200:  # Success
+        invalidate_report_cache()
         ActivityLog.create_log(
             user_id=get_jwt_identity(),
             action='INVOICES_BULK_RESTORED',
@@ -460,6 +500,7 @@ def bulk_delete_invoices():
 
     # Log activity
     if result[1] == 200:  # Success
+        invalidate_report_cache()
         ActivityLog.create_log(
             user_id=get_jwt_identity(),
             action='INVOICES_BULK_DELETED',
@@ -481,20 +522,16 @@ def generate_invoice_pdf(invoice_id: str):
     Generate and download professional invoice PDF with QR code
     """
     try:
-        from flask import send_file
-
-        # Fetch invoice with all related data
-        invoice = Invoice.find_by_id(invoice_id)
+        # Fetch invoice, customer and items (with product names) in one query
+        invoice = Invoice.find_with_details(invoice_id)
         if not invoice:
             return error_response('not_found', ERROR_MESSAGES["not_found"]["invoice"], 404)
 
-        # Get customer details
-        customer = Customer.find_by_id(invoice.customer_id)
+        customer = invoice.customer
         if not customer:
             return error_response('not_found', "Customer not found for this invoice.", 404)
 
-        # Get invoice items
-        items = InvoiceItem.find_by_invoice_id(invoice_id)
+        items = invoice.items
 
         # Format invoice data for PDF
         invoice_data = {
@@ -517,31 +554,59 @@ def generate_invoice_pdf(invoice_id: str):
             'total': float(invoice.total_amount) if invoice.total_amount else 0.0
         }
 
-        # Add items with product details
+        # Add items; product names come from the join above
         for item in items:
-            product = Product.find_by_id(item.product_id)
             invoice_data['items'].append({
-                'product_name': getattr(item, 'product_name', None) or (product.name if product else 'Unknown Product'),
+                'product_name': getattr(item, 'product_name', None) or 'Unknown Product',
                 'quantity': item.quantity,
                 'price': float(item.price) if getattr(item, 'price', None) else 0.0,
                 'tax_rate': 0.0,
                 'total': float(item.total) if getattr(item, 'total', None) else 0.0
             })
 
-        # Get current user for company details
-        current_user_id = get_jwt_identity()
-        current_user = User.find_by_id(current_user_id)
+        # Current user (already loaded by the JWT user loader) supplies company details
+        current_user = get_current_user()
+        company = tuple(
+            getattr(current_user, f, None) for f in (
+                'company_name', 'company_address', 'company_city',
+                'company_phone', 'company_email', 'company_gst', 'currency_symbol'
+            )
+        )
 
-        # Generate PDF
-        pdf_generator = InvoicePDFGenerator(user=current_user)
-        pdf_buffer = pdf_generator.generate_invoice_pdf(invoice_data)
+        # Reuse a previously rendered PDF when nothing that feeds into it has changed
+        digest = blake2b(dumps_bytes([invoice_data, company]), digest_size=16).digest()
+        cache_key = (invoice_id, digest)
+
+        # The digest covers every render input, so it doubles as the ETag
+        etag = digest.hex()
+        if request.if_none_match.contains(etag):
+            response = current_app.response_class(status=304)
+            response.set_etag(etag)
+            return response
+
+        pdf_bytes = invoice_pdf_cache.get(cache_key)
+        if pdf_bytes is None:
+            # Render off the request thread; slow renders answer 202 and the client
+            # retries the same URL, which picks up the cached result when ready.
+            future = invoice_pdf_renderer.submit(
+                cache_key,
+                lambda: InvoicePDFGenerator(user=current_user).generate_invoice_pdf(invoice_data).getvalue()
+            )
+            try:
+                pdf_bytes = future.result(timeout=PDF_SYNC_WAIT_SECONDS)
+            except FutureTimeoutError:
+                return success_response(
+                    message="Invoice PDF is being generated. Retry this request shortly to download it.",
+                    status=202
+                )
 
         # Send PDF as file download
         return send_file(
-            pdf_buffer,
+            BytesIO(pdf_bytes),
             mimetype='application/pdf',
             as_attachment=True,
-            download_name=f'invoice-{invoice.invoice_number}.pdf'
+            download_name=f'invoice-{invoice.invoice_number}.pdf',
+            etag=etag
         )
 
     except Exception as e:
@@ -557,21 +622,19 @@ def initiate_phonepe_payment(invoice_id):
     Returns payment URL for customer to complete payment.
     """
     try:
-        from app.services.phonepe_service import phonepe_service
-
         # Get invoice
         invoice = Invoice.find_by_id(invoice_id)
         if not invoice:
             return error_response('not_found', ERROR_MESSAGES["not_found"]["invoice"], status=404)
 
         # Get customer details
-        customer = Customer.find_by_id(invoice.customer_id)
+        customer = Customer.find_by_id_cached(invoice.customer_id)
         if not customer:
             return error_response('not_found', 'Customer not found for this invoice', status=404)
 
         # Calculate remaining amount to be paid
         total_paid = Payment.get_total_paid(invoice_id)
-        remaining_amount = Decimal(invoice.total_amount) - total_paid
+        remaining_amount = to_decimal(invoice.total_amount) - total_paid
 
         if remaining_amount <= 0:
             return error_response(
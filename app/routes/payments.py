@@ -1,3 +1,5 @@
+from datetime import datetime, timezone
+
 from flask import Blueprint, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from marshmallow import ValidationError
@@ -5,20 +7,23 @@ from marshmallow import ValidationError
 from app.database.models.invoice import Invoice
 from app.database.models.customer import Customer
 from app.database.models.payment import Payment
+from app.database.models.report_model import invalidate_report_cache
 from app.database.models.activity_model import ActivityLog
 from app.services.email_service import email_service
-from app.schemas.payment_schema import PaymentSchema, PaymentDetailSchema
+from app.schemas.payment_schema import PaymentSchema, PaymentDetailSchema, dump_payments, validate_payment
 from app.utils.response import success_response, error_response
 from app.utils.error_messages import ERROR_MESSAGES
 from app.utils.auth import require_admin, require_permission
-from app.utils.pagination import get_pagination
-from app.utils.utils import update_invoice_status
-from app.utils.helpers import validate_request, get_or_404
+from app.utils.pagination import get_pagination, get_cursor, encode_cursor, page_meta
+from app.utils.args import qbool, qfields
+from app.utils.utils import update_invoice_status, to_decimal
+from app.utils.helpers import get_or_404
 
 payments_blueprint = Blueprint('payments', __name__)
 
-# Instantiate schema
+# Instantiate schemas
 payment_schema = PaymentSchema()
+payment_detail_schema = PaymentDetailSchema()
 
 @payments_blueprint.route('/payments/search/', methods=['GET'])
 @jwt_required()
@@ -42,7 +47,7 @@ def search_payments():
             page=page,
             per_page=per_page
         )
-        serialized_payments = payment_schema.dump(payments, many=True)
+        serialized_payments = dump_payments(payments)
         return success_response(
             serialized_payments,
             message="Payments retrieved successfully.",
@@ -57,9 +62,9 @@ def search_payments():
 @require_permission('payments.create')
 def record_payment(invoice_id):
     try:
-        validated_data = validate_request(payment_schema)
-    except ValueError as err:
-        return error_response(error_code='validation_error', message="The provided payment data is invalid.", details=err.args[0], status=400)
+        validated_data = validate_payment(request.get_json() or {})
+    except ValidationError as err:
+        return error_response(error_code='validation_error', message="The provided payment data is invalid.", details=err.messages, status=400)
 
     try:
         invoice = get_or_404(Invoice, invoice_id, "Invoice")
@@ -68,12 +73,15 @@ def record_payment(invoice_id):
 
         # Ensure the invoice_id from the URL is used for the payment
         validated_data['invoice_id'] = invoice_id
+        # Set here rather than by the DB so the response can be built without re-reading the row
+        validated_data['created_at'] = datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
 
         payment_id = Payment.create(validated_data)
 
         if payment_id:
             # Update invoice status based on new total paid
-            update_invoice_status(invoice_id, invoice.total_amount)
+            status = update_invoice_status(invoice_id, invoice.total_amount, current_status=invoice.status)
+            invalidate_report_cache()
 
             # Log activity
             ActivityLog.create_log(
@@ -91,22 +99,18 @@ def record_payment(invoice_id):
                 ip_address=request.remote_addr
             )
 
-            new_payment = Payment.find_by_id(payment_id)
+            new_payment = Payment.from_created(validated_data)
 
             # Send email notification
-            customer = Customer.find_by_id(invoice.customer_id)
+            customer = Customer.find_by_id_cached(invoice.customer_id)
             if customer:
-                # Refresh invoice to get latest status/amounts if needed, or just use to_dict which handles types
-                # We need to ensure amount_paid and due_amount are present for the email
-                # Since find_by_id might not have them, we might want to calculate them or rely on to_dict defaults
-                # For now, let's use to_dict() to fix the type error
+                # The invoice was loaded with its paid total before this payment; add it on
                 invoice_dict = invoice.to_dict()
-
-                # Manually calculate paid/due if missing (since find_by_id might not include aggregates)
-                if 'amount_paid' not in invoice_dict or invoice_dict['amount_paid'] == 0:
-                     paid_amount = Payment.get_total_paid(invoice_id)
-                     invoice_dict['amount_paid'] = float(paid_amount)
-                     invoice_dict['due_amount'] = invoice_dict['total_amount'] - invoice_dict['amount_paid']
+                # Money columns come back from DBManager as strings; convert before adding
+                amount_paid = to_decimal(invoice.amount_paid) + new_payment.amount
+                invoice_dict['amount_paid'] = float(amount_paid)
+                invoice_dict['due_amount'] = float(to_decimal(invoice.total_amount) - amount_paid)
+                invoice_dict['status'] = status
 
                 email_service.send_payment_received_email(new_payment.to_dict(), invoice_dict, customer)
 
@@ -122,12 +126,19 @@ def record_payment(invoice_id):
 def get_all_payments():
     page, per_page = get_pagination()
     try:
-        payments, total = Payment.find_with_pagination_and_count(page=page, per_page=per_page)
-        serialized_payments = payment_schema.dump(payments, many=True)
+        only = qfields(payment_schema.fields)
+    except ValueError as err:
+        return error_response(error_code='validation_error', message=str(err), status=400)
+    try:
+        payments, total = Payment.find_with_pagination_and_count(
+            page=page, per_page=per_page, after_id=get_cursor(), with_total=qbool('with_total', default=True)
+        )
+        next_cursor = encode_cursor(payments[-1].id) if len(payments) == per_page else None
+        serialized_payments = dump_payments(payments, only=only)
         return success_response(
             serialized_payments,
             message="Payments retrieved successfully.",
-            meta={'total': total, 'page': page, 'per_page': per_page}
+            meta=page_meta(payments, total, page, per_page, next_cursor=next_cursor)
         )
     except Exception as e:
         return error_response(error_code='server_error', message=ERROR_MESSAGES["server_error"]["fetch_payment"], details=str(e), status=500)
@@ -138,18 +149,23 @@ def get_all_payments():
 def get_payments_for_invoice(invoice_id):
     page, per_page = get_pagination()
     try:
-        invoice = get_or_404(Invoice, invoice_id, "Invoice")
-        if not invoice:
+        only = qfields(payment_schema.fields)
+    except ValueError as err:
+        return error_response(error_code='validation_error', message=str(err), status=400)
+    try:
+        # Payments, their total and the invoice existence check come back from one query
+        page_result = Payment.find_page_for_invoice(
+            invoice_id, page=page, per_page=per_page, with_total=qbool('with_total', default=True)
+        )
+        if page_result is None:
             return error_response(error_code='not_found', message=ERROR_MESSAGES["not_found"]["invoice"], status=404)
+        payments, total = page_result
 
-        # Get payments for this invoice
-        payments, total = Payment.find_by_invoice_id_with_pagination_and_count(invoice_id, page=page, per_page=per_page)
-
-        serialized_payments = payment_schema.dump(payments, many=True)
+        serialized_payments = dump_payments(payments, only=only)
         return success_response(
             serialized_payments,
             message=f"Payments for invoice {invoice_id} retrieved successfully.",
-            meta={'total': total, 'page': page, 'per_page': per_page}
+            meta=page_meta(payments, total, page, per_page)
         )
     except Exception as e:
         return error_response(error_code='server_error', message=ERROR_MESSAGES["server_error"]["fetch_payment"], details=str(e), status=500)
@@ -161,7 +177,6 @@ def get_payments_for_invoice(invoice_id):
 def get_payment(payment_id):
     """Get payment with customer and invoice details."""
     try:
-        payment_detail_schema = PaymentDetailSchema()
         payment_data = Payment.get_payment_with_details(payment_id)
         if payment_data:
             return success_response(payment_detail_schema.dump(payment_data), message="Payment retrieved successfully.")
@@ -3,13 +3,19 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.database.models.permission_model import UserPermission
 from app.database.models.user import User
 from app.utils.auth import require_admin
-from app.utils.permissions import PERMISSIONS, PERMISSION_CATEGORIES
-from app.utils.response import success_response, error_response
+from app.utils.permissions import ALL_PERMISSIONS, PERMISSIONS, PERMISSION_CATEGORIES
+from app.utils.response import success_response, success_body, body_response, error_response
 from app.utils.error_messages import ERROR_MESSAGES
 from app.utils.helpers import get_or_404
 
 permissions_blueprint = Blueprint('permissions', __name__)
 
+# The permission catalog is static, so its response body is encoded once at import
+_LIST_PERMISSIONS_BODY = success_body({
+    'permissions': PERMISSIONS,
+    'categories': PERMISSION_CATEGORIES
+}, message="Permissions retrieved successfully.")
+
 
 # ---------------- List All Permissions ----------------
 @permissions_blueprint.route('/permissions', methods=['GET'])
@@ -18,10 +24,7 @@ def list_permissions():
     """
     List all available permissions with descriptions and categories.
     """
-    return success_response({
-        'permissions': PERMISSIONS,
-        'categories': PERMISSION_CATEGORIES
-    }, message="Permissions retrieved successfully.")
+    return body_response(_LIST_PERMISSIONS_BODY)
 
 
 # ---------------- Get User Permissions ----------------
@@ -38,13 +41,14 @@ def get_user_permissions(user_id: str):
         if not user:
             return error_response('not_found', ERROR_MESSAGES["not_found"]["user"], 404)
 
-        permissions = user.get_permissions()
+        is_admin = user.role == 'admin'
+        permissions = list(ALL_PERMISSIONS) if is_admin else user.get_permissions()
 
         return success_response({
             'user_id': user_id,
             'role': user.role,
             'permissions': permissions,
-            'is_admin': user.role == 'admin'
+            'is_admin': is_admin
         }, message="User permissions retrieved successfully.")
 
     except Exception as e:
@@ -4,13 +4,14 @@ from flask_jwt_extended import jwt_required
 from marshmallow import ValidationError
 
 from app.database.models.product import Product
-from app.schemas.product_schema import ProductSchema
+from app.schemas.product_schema import ProductSchema, dump_products
 from app.utils.response import success_response, error_response
 from app.utils.error_messages import ERROR_MESSAGES
 from app.utils.auth import require_admin, require_permission
 from app.utils.auth import require_admin, require_permission
-from app.utils.pagination import get_pagination
+from app.utils.pagination import get_pagination, get_cursor, encode_cursor, page_meta
 from app.utils.helpers import validate_request, get_or_404, bulk_action_handler
+from app.utils.args import qbool, qfields
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.database.models.activity_model import ActivityLog
 
@@ -32,10 +33,10 @@ def search_products():
     if not search_term:
         return error_response(error_code='validation_error', message="Search term 'q' is required.", status=400)
 
-    include_deleted = request.args.get('include_deleted', 'false').lower() == 'true'
+    include_deleted = qbool('include_deleted')
     try:
         products, _ = Product.search_product(search_term, include_deleted=include_deleted)
-        return success_response(product_schema.dump(products, many=True),
+        return success_response(dump_products(products),
                                 message="Products matching the search term retrieved successfully.")
     except Exception as e:
         return error_response('server_error', "Error occurred during search.", details=str(e), status=500)
@@ -49,7 +50,7 @@ def get_deleted_products():
     page, per_page = get_pagination()
     try:
         products, total = Product.find_with_pagination_and_count(page=page, per_page=per_page, include_deleted=True, deleted_only=True)
-        return success_response(product_schema.dump(products, many=True),
+        return success_response(dump_products(products),
                                 meta={'total': total, 'page': page, 'per_page': per_page},
                                 message="Deleted products retrieved successfully.")
     except Exception as e:
@@ -88,12 +89,20 @@ def create_product():
 @require_permission('products.list')
 def get_products():
     page, per_page = get_pagination()
-    deleted = request.args.get('deleted', 'false').lower() == 'true'
+    deleted = qbool('deleted')
     try:
-        products, total = Product.find_with_pagination_and_count(page=page, per_page=per_page, deleted_only=deleted)
+        only = qfields(product_schema.fields)
+    except ValueError as err:
+        return error_response('validation_error', message=str(err), status=400)
+    try:
+        products, total = Product.find_with_pagination_and_count(
+            page=page, per_page=per_page, deleted_only=deleted, after_id=get_cursor(),
+            with_total=qbool('with_total', default=True)
+        )
+        next_cursor = encode_cursor(products[-1].id) if len(products) == per_page else None
         message = "Deleted products retrieved successfully" if deleted else "Products retrieved successfully"
-        return success_response(product_schema.dump(products, many=True),
-                                meta={'total': total, 'page': page, 'per_page': per_page},
+        return success_response(dump_products(products, only=only),
+                                meta=page_meta(products, total, page, per_page, next_cursor=next_cursor),
                                 message=message)
     except Exception as e:
         return error_response('server_error', ERROR_MESSAGES["server_error"]["fetch_product"], details=str(e), status=500)
@@ -103,7 +112,7 @@ def get_products():
 @jwt_required()
 @require_permission('products.view')
 def get_product(product_id):
-    include_deleted = request.args.get('include_deleted', 'false').lower() == 'true'
+    include_deleted = qbool('include_deleted')
     try:
         product = Product.find_by_id(product_id, include_deleted=include_deleted)
         if product:
@@ -119,9 +128,9 @@ def get_product(product_id):
 def update_product(product_id):
     try:
         validated_data = validate_request(product_update_schema, partial=True)
-        if not Product.update_product(product_id, validated_data):
+        updated_product = Product.update_product(product_id, validated_data)
+        if not updated_product:
             return error_response('not_found', ERROR_MESSAGES["not_found"]["product"], status=404)
-        updated_product = Product.find_by_id(product_id)
 
         # Log activity
         ActivityLog.create_log(
@@ -13,13 +13,14 @@ def trigger_overdue_check():
     """
     Manually trigger the overdue invoice check.
     This is useful for testing and can also be used by admins to run checks on-demand.
+    The check runs in the background; poll /scheduler/jobs/<job_id> for its outcome.
     """
     try:
-        scheduler_service.check_overdue_invoices()
+        job_id = scheduler_service.enqueue_overdue_check()
         return success_response(
-            result={'message': 'Overdue invoice check completed'},
+            result={'job_id': job_id, 'status': 'queued'},
             message='Overdue invoice check triggered successfully',
-            status=200
+            status=202
         )
     except Exception as e:
         return error_response(
@@ -28,3 +29,21 @@ def trigger_overdue_check():
             details=str(e),
             status=500
         )
+
+
+@scheduler_blueprint.route('/scheduler/jobs/<string:job_id>', methods=['GET'])
+@jwt_required()
+@require_admin
+def get_job_status(job_id):
+    """
+    Status of an on-demand job: queued, running, completed (with its result) or failed.
+    Statuses are kept in memory by the worker that ran the job, for about an hour.
+    """
+    status = scheduler_service.get_job_status(job_id)
+    if status is None:
+        return error_response(
+            error_code='not_found',
+            message='Job not found or expired',
+            status=404
+        )
+    return success_response(result=status, message='Job status retrieved successfully')
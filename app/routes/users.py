@@ -11,10 +11,16 @@ from app.utils.error_messages import ERROR_MESSAGES
 from app.utils.auth import require_admin, require_permission
 from app.utils.pagination import get_pagination
 from app.utils.helpers import validate_request, get_or_404, bulk_action_handler
+from app.utils.args import qbool
 from app.schemas.user_schema import UserUpdateSchema, ProfileUpdateSchema, PasswordChangeSchema, BillingInfoSchema
 
 users_blueprint = Blueprint('users', __name__)
 
+user_update_schema = UserUpdateSchema()
+profile_update_schema = ProfileUpdateSchema()
+password_change_schema = PasswordChangeSchema()
+billing_info_schema = BillingInfoSchema()
+
 @users_blueprint.route('/users/me', methods=['GET'])
 @jwt_required()
 def get_current_user_profile():
@@ -49,7 +55,7 @@ def update_user_profile(user_id):
         return error_response(error_code='not_found', message=ERROR_MESSAGES["not_found"]["user"], status=404)
 
     try:
-        validated_data = validate_request(UserUpdateSchema())
+        validated_data = validate_request(user_update_schema)
     except ValueError as err:
         return error_response(
             error_code='validation_error',
@@ -112,7 +118,7 @@ def update_profile():
         return error_response(error_code='not_found', message=ERROR_MESSAGES["not_found"]["user"], status=404)
 
     try:
-        validated_data = validate_request(ProfileUpdateSchema())
+        validated_data = validate_request(profile_update_schema)
     except ValueError as err:
         return error_response(
             error_code='validation_error',
@@ -167,7 +173,7 @@ def change_password():
         return error_response(error_code='not_found', message=ERROR_MESSAGES["not_found"]["user"], status=404)
 
     try:
-        validated_data = validate_request(PasswordChangeSchema())
+        validated_data = validate_request(password_change_schema)
     except ValueError as err:
         return error_response(
             error_code='validation_error',
@@ -243,7 +249,7 @@ def update_billing_info():
         return error_response(error_code='not_found', message=ERROR_MESSAGES["not_found"]["user"], status=404)
 
     try:
-        validated_data = validate_request(BillingInfoSchema())
+        validated_data = validate_request(billing_info_schema)
     except ValueError as err:
         return error_response(
             error_code='validation_error',
@@ -290,7 +296,7 @@ def update_billing_info():
 @require_permission('users.list')
 def get_all_users():
     page, per_page = get_pagination()
-    deleted = request.args.get('deleted', 'false').lower() == 'true'
+    deleted = qbool('deleted')
     try:
         users, total = User.find_with_pagination_and_count(page=page, per_page=per_page, deleted_only=deleted)
         message = "Deleted users retrieved successfully" if deleted else "Users retrieved successfully"
@@ -312,7 +318,7 @@ def get_user(user_id):
     if not (user.is_admin or str(current_user_id) == str(user_id)):
         return error_response(error_code='forbidden', message=ERROR_MESSAGES["forbidden"], status=403)
 
-    include_deleted = request.args.get('include_deleted', 'false').lower() == 'true'
+    include_deleted = qbool('include_deleted')
     try:
         target_user = User.find_by_id(user_id, include_deleted=include_deleted)
         if target_user:
@@ -6,6 +6,7 @@ from app.services.phonepe_service import phonepe_service
 from app.database.models.invoice import Invoice
 from app.database.models.customer import Customer
 from app.database.models.payment import Payment
+from app.database.models.report_model import invalidate_report_cache
 from app.database.models.activity_model import ActivityLog
 from app.services.email_service import email_service
 from app.utils.response import success_response, error_response
@@ -116,7 +117,8 @@ def phonepe_webhook():
 
             if payment_id:
                 # Update invoice status
-                update_invoice_status(invoice_id, invoice.total_amount)
+                update_invoice_status(invoice_id, invoice.total_amount, current_status=invoice.status)
+                invalidate_report_cache()
 
                 # Log activity
                 ActivityLog.create_log(
@@ -134,7 +136,7 @@ def phonepe_webhook():
                 )
 
                 # Send email notification
-                customer = Customer.find_by_id(invoice.customer_id)
+                customer = Customer.find_by_id_cached(invoice.customer_id)
                 new_payment = Payment.find_by_id(payment_id)
                 if customer and new_payment:
                     email_service.send_payment_received_email(new_payment.to_dict(), invoice, customer)
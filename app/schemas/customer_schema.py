@@ -38,3 +38,27 @@ class CustomerListSchema(Schema):
 class BulkDeleteSchema(Schema):
     """Schema for bulk operations (e.g., deletion)."""
     ids = fields.List(fields.Str(), required=True)
+
+def dump_customer_summary(customer):
+    """
+    Serialize a Customer exactly like CustomerSummarySchema().dump(customer),
+    without marshmallow's per-field dispatch. Used for the streamed customer list.
+    """
+    created_at, updated_at = customer.created_at, customer.updated_at
+    return {
+        'id': customer.id,
+        'name': customer.name,
+        'email': customer.email,
+        'phone': customer.phone,
+        'address': customer.address,
+        'gst_number': customer.gst_number,
+        'created_at': None if created_at is None else created_at.isoformat(),
+        'updated_at': None if updated_at is None else updated_at.isoformat(),
+        'status': customer.status,
+    }
+
+# Shared instances used by the customer routes
+customer_schema = CustomerSchema()
+customer_summary_schema = CustomerSummarySchema()
+customer_detail_schema = CustomerDetailSchema()
+customer_update_schema = CustomerUpdateSchema()
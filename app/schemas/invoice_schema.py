@@ -21,5 +21,7 @@ class InvoiceSchema(Schema):
     is_mark_as_paid = fields.Boolean(load_default=False)
     amount_paid = fields.Decimal(places=2, as_string=True, allow_none=True)
 
-# Create an instance of the schema to be used in the application
+# Create instances of the schema to be used in the application.
+# Both are built once at import so field setup is not repeated per request.
 invoice_schema = InvoiceSchema()
+invoice_update_schema = InvoiceSchema(partial=True)
@@ -1,5 +1,9 @@
-from marshmallow import Schema, fields, validate, pre_dump
+from marshmallow import Schema, ValidationError, fields, validate, pre_dump
 from datetime import date
+from decimal import Decimal, InvalidOperation
+
+_CENTS = Decimal('0.01')
+_PAYMENT_METHODS = ("cash", "card", "upi", "bank_transfer")
 
 # Schema for validating an initial payment made during invoice creation.
 class InitialPaymentSchema(Schema):
@@ -12,7 +16,7 @@ class InitialPaymentSchema(Schema):
     # The payment method. Aligns with the database ENUM.
     method = fields.Str(
         required=True,
-        validate=validate.OneOf(["cash", "card", "upi", "bank_transfer"], error="Invalid payment method.")
+        validate=validate.OneOf(_PAYMENT_METHODS, error="Invalid payment method.")
     )
     # An optional payment reference number (e.g., transaction ID).
     reference_no = fields.Str(allow_none=True)
@@ -33,7 +37,7 @@ class PaymentSchema(Schema):
     # The payment method. Renamed from payment_method to be consistent.
     method = fields.Str(
         required=True,
-        validate=validate.OneOf(["cash", "card", "upi", "bank_transfer"], error="Invalid payment method.")
+        validate=validate.OneOf(_PAYMENT_METHODS, error="Invalid payment method.")
     )
     reference_no = fields.Str(allow_none=True)
     created_at = fields.DateTime(dump_only=True)
@@ -73,6 +77,122 @@ class PaymentSchema(Schema):
         return result
 
 
+_METHODS = frozenset(_PAYMENT_METHODS)
+_LOAD_FIELDS = frozenset(('amount', 'payment_date', 'method', 'reference_no'))
+_MISSING = 'Missing data for required field.'
+_NULL = 'Field may not be null.'
+_NOT_A_STRING = 'Not a valid string.'
+
+
+def _load_amount(value):
+    if value is None:
+        raise ValueError(_NULL)
+    if isinstance(value, bool):
+        raise ValueError('Not a valid number.')
+    try:
+        num = Decimal(str(value))
+    except (InvalidOperation, TypeError, ValueError):
+        raise ValueError('Not a valid number.')
+    if not num.is_finite():
+        raise ValueError('Special numeric values (nan or infinity) are not permitted.')
+    num = num.quantize(_CENTS)
+    # Compared against the float, as validate.Range(min=0.01) does
+    if num < 0.01:
+        raise ValueError('Payment amount must be positive.')
+    return num
+
+
+def _load_payment_date(value):
+    if value is None:
+        return None
+    if not value or not isinstance(value, str):
+        raise ValueError('Not a valid date.')
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValueError('Not a valid date.')
+
+
+def _load_method(value):
+    if value is None:
+        raise ValueError(_NULL)
+    if not isinstance(value, str):
+        raise ValueError(_NOT_A_STRING)
+    if value not in _METHODS:
+        raise ValueError('Invalid payment method.')
+    return value
+
+
+def validate_payment(data):
+    """
+    Load a payment payload exactly like PaymentSchema().load(data): same output keys,
+    defaults and ValidationError messages, without marshmallow's per-field dispatch.
+    Used by record_payment; other endpoints keep using the schema.
+    """
+    if not isinstance(data, dict):
+        raise ValidationError({'_schema': ['Invalid input type.']})
+
+    result, errors = {}, {}
+    for name, loader, required in (
+        ('amount', _load_amount, True),
+        ('payment_date', _load_payment_date, False),
+        ('method', _load_method, True),
+    ):
+        if name in data:
+            try:
+                result[name] = loader(data[name])
+            except ValueError as e:
+                errors[name] = [e.args[0]]
+        elif required:
+            errors[name] = [_MISSING]
+        else:
+            result[name] = date.today()
+
+    if 'reference_no' in data:
+        reference_no = data['reference_no']
+        if reference_no is None or isinstance(reference_no, str):
+            result['reference_no'] = reference_no
+        else:
+            errors['reference_no'] = [_NOT_A_STRING]
+
+    for key in data:
+        if key not in _LOAD_FIELDS:
+            errors[key] = ['Unknown field.']
+
+    if errors:
+        raise ValidationError(errors)
+    return result
+
+
+def dump_payments(payments, only=None):
+    """
+    Serialize Payment instances exactly like PaymentSchema().dump(payments, many=True),
+    without marshmallow's per-field dispatch. Used by the payment list endpoints.
+    `only` keeps just the named keys, in that order (a ?fields= sparse fieldset);
+    the nested invoice/customer keys are left out on rows that lack them.
+    """
+    results = []
+    for p in payments:
+        amount, payment_date, created_at = p.amount, p.payment_date, getattr(p, 'created_at', None)
+        result = {
+            'id': p.id,
+            'invoice_id': p.invoice_id,
+            'amount': None if amount is None else str(amount.quantize(_CENTS)),
+            'payment_date': None if payment_date is None else payment_date.isoformat(),
+            'method': p.method,
+            'reference_no': p.reference_no,
+            'created_at': None if created_at is None else created_at.isoformat(),
+        }
+        if hasattr(p, 'invoice_number'):
+            result['invoice'] = {'invoice_number': p.invoice_number}
+        if hasattr(p, 'customer_name'):
+            result['customer'] = {'name': p.customer_name, 'email': p.customer_email}
+        results.append(result)
+    if only:
+        return [{k: r[k] for k in only if k in r} for r in results]
+    return results
+
+
 # Schema for payment with customer and invoice details
 class PaymentDetailSchema(Schema):
     id = fields.Str()
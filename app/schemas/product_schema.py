@@ -1,6 +1,9 @@
 
 from marshmallow import Schema, fields, validate
-from decimal import ROUND_HALF_UP
+from decimal import Decimal, ROUND_HALF_UP
+
+_CENTS = Decimal('0.01')
+_DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%S'
 
 class ProductSchema(Schema):
     """
@@ -24,5 +27,29 @@ class ProductSchema(Schema):
         required=True,
         validate=validate.Range(min=0, error="Stock must be a non-negative integer.")
     )
-    created_at = fields.DateTime(format='%Y-%m-%dT%H:%M:%S', dump_only=True)
-    updated_at = fields.DateTime(format='%Y-%m-%dT%H:%M:%S', dump_only=True)
+    created_at = fields.DateTime(format=_DATETIME_FORMAT, dump_only=True)
+    updated_at = fields.DateTime(format=_DATETIME_FORMAT, dump_only=True)
+
+
+def dump_products(products, only=None):
+    """
+    Serialize Product instances exactly like ProductSchema().dump(products, many=True),
+    without marshmallow's per-field dispatch. Used by the product list endpoints.
+    `only` keeps just the named keys, in that order (a ?fields= sparse fieldset).
+    """
+    results = []
+    for p in products:
+        price, stock, created_at, updated_at = p.price, p.stock, p.created_at, getattr(p, 'updated_at', None)
+        results.append({
+            'id': p.id,
+            'product_code': p.product_code,
+            'name': p.name,
+            'description': p.description,
+            'price': None if price is None else price.quantize(_CENTS, rounding=ROUND_HALF_UP),
+            'stock': None if stock is None else int(stock),
+            'created_at': None if created_at is None else created_at.strftime(_DATETIME_FORMAT),
+            'updated_at': None if updated_at is None else updated_at.strftime(_DATETIME_FORMAT),
+        })
+    if only:
+        return [{k: r[k] for k in only} for r in results]
+    return results
@@ -1,9 +1,33 @@
-import threading
+import functools
+import os
+import traceback
+from concurrent.futures import ThreadPoolExecutor
 from flask import current_app, render_template
 from flask_mail import Message
 from flask_jwt_extended import get_jwt_identity
 from app.database.models.user import User
 
+# Shared pool for notification emails: settings lookups, rendering and SMTP all run here
+_email_executor = ThreadPoolExecutor(max_workers=int(os.getenv("EMAIL_WORKERS", "2")), thread_name_prefix="email")
+
+def _run_in_app_context(app, func, args, kwargs):
+    with app.app_context():
+        try:
+            func(*args, **kwargs)
+        except Exception:
+            current_app.logger.exception(f"[EMAIL ERROR] {func.__name__} failed")
+
+def _in_background(func):
+    """
+    Queue the wrapped send_*_email call on the email pool and return immediately,
+    so the request never waits on notification settings, templates or SMTP.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        app = current_app._get_current_object()
+        _email_executor.submit(_run_in_app_context, app, func, args, kwargs)
+    return wrapper
+
 class EmailService:
     @staticmethod
     def send_async_email(app, msg):
@@ -15,7 +39,6 @@ class EmailService:
                 print(f"[EMAIL] Email sent successfully!")
             except Exception as e:
                 print(f"[EMAIL ERROR] Failed to send email: {e}")
-                import traceback
                 traceback.print_exc()
 
     @staticmethod
@@ -29,10 +52,8 @@ class EmailService:
         msg = Message(subject, recipients=recipients, sender=sender)
         msg.html = render_template(template, **kwargs)
 
-        # Use threading for async sending
-        thr = threading.Thread(target=EmailService.send_async_email, args=[app, msg])
-        thr.start()
-        print(f"[EMAIL] Email thread started")
+        # Callers already run on the email pool (see _in_background), so send inline
+        EmailService.send_async_email(app, msg)
 
     @staticmethod
     def get_sender_for_invoice(invoice):
@@ -68,6 +89,7 @@ class EmailService:
             return True
 
     @staticmethod
+    @_in_background
     def send_invoice_created_email(invoice, customer):
         print(f"[EMAIL] Attempting to send invoice created email...")
         print(f"[EMAIL] Customer email: {customer.email}")
@@ -102,6 +124,7 @@ class EmailService:
         print(f"[EMAIL] Email queued for sending")
 
     @staticmethod
+    @_in_background
     def send_payment_received_email(payment, invoice, customer):
         if not customer.email:
             return
@@ -128,6 +151,7 @@ class EmailService:
         )
 
     @staticmethod
+    @_in_background
     def send_invoice_overdue_email(invoice, customer, days_overdue):
         if not customer.email:
             return
@@ -1,14 +1,22 @@
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
+from uuid6 import uuid7
+
+from app.utils.ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
+# How long the status of an on-demand job stays available for polling
+JOB_STATUS_TTL_SECONDS = 3600
+
 class SchedulerService:
     def __init__(self, app=None):
         self.scheduler = BackgroundScheduler()
         self.app = app
+        # Status of jobs started through enqueue_overdue_check, per worker process
+        self._job_status = TTLCache(max_entries=256, ttl_seconds=JOB_STATUS_TTL_SECONDS)
         if app:
             self.init_app(app)
 
@@ -25,14 +33,49 @@ class SchedulerService:
         self.scheduler.start()
         logger.info("Scheduler started - Overdue invoice check scheduled for 9:00 AM daily")
 
+    def enqueue_overdue_check(self):
+        """
+        Run the overdue invoice check once, right away, on the scheduler's thread pool.
+        Returns a job id whose progress can be read with get_job_status().
+        """
+        job_id = str(uuid7())
+        self._set_job_status(job_id, status='queued')
+        self.scheduler.add_job(
+            func=self._run_tracked,
+            args=(job_id, self.check_overdue_invoices),
+            id=job_id,
+            name='Check and notify overdue invoices (on demand)'
+        )
+        return job_id
+
+    def get_job_status(self, job_id):
+        """Status dict of an on-demand job, or None if it is unknown to this worker or expired."""
+        return self._job_status.get(job_id)
+
+    def _set_job_status(self, job_id, **fields):
+        status = dict(self._job_status.get(job_id) or {'job_id': job_id})
+        status.update(fields, updated_at=datetime.now(timezone.utc).isoformat())
+        self._job_status.set(job_id, status)
+
+    def _run_tracked(self, job_id, func):
+        self._set_job_status(job_id, status='running')
+        try:
+            result = func()
+        except Exception as e:
+            logger.error(f"On-demand job {job_id} failed: {str(e)}")
+            self._set_job_status(job_id, status='failed', error=str(e))
+            return
+        self._set_job_status(job_id, status='completed', result=result)
+
     def check_overdue_invoices(self):
         """
         Check for overdue invoices and send email notifications
         This runs as a scheduled background task
+        Returns {'overdue': ..., 'sent': ...} counts when the check ran.
         """
         if not self.app:
             logger.error("App context not available for scheduler")
-            return
+            return None
 
         with self.app.app_context():
             try:
@@ -45,13 +88,16 @@ class SchedulerService:
 
                 if not overdue_invoices:
                     logger.info("No overdue invoices found")
-                    return
+                    return {'overdue': 0, 'sent': 0}
+
+                # Load every distinct customer once instead of once per invoice
+                customers = Customer.find_by_ids([invoice.customer_id for invoice in overdue_invoices])
 
                 sent_count = 0
                 for invoice in overdue_invoices:
                     try:
                         # Get customer details
-                        customer = Customer.find_by_id(invoice.customer_id)
+                        customer = customers.get(invoice.customer_id)
                         if not customer or not customer.email:
                             logger.warning(f"Skipping invoice {invoice.invoice_number} - no customer email")
                             continue
@@ -72,9 +118,11 @@ class SchedulerService:
                         continue
 
                 logger.info(f"Overdue invoice check completed. Sent {sent_count} notifications out of {len(overdue_invoices)} overdue invoices")
+                return {'overdue': len(overdue_invoices), 'sent': sent_count}
 
             except Exception as e:
                 logger.error(f"Error during overdue invoice check: {str(e)}")
+                raise
 
     def shutdown(self):
         """Shutdown the scheduler gracefully"""
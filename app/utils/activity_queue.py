@@ -0,0 +1,80 @@
+import atexit
+import logging
+import queue
+import threading
+from typing import Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_MAX_QUEUED = 10000
+_BATCH_SIZE = 100
+_DRAIN_TIMEOUT = 0.5
+
+
+class ActivityLogQueue:
+    """
+    Buffers activity log rows in memory and writes them in batches from a daemon
+    thread, so audit inserts stay off the request path.
+    The writer thread starts on first use, i.e. inside each gunicorn worker after fork.
+    If the queue is full, the row is written synchronously rather than dropped.
+    """
+
+    def __init__(self, writer: Callable[[List[Tuple]], None]):
+        self._writer = writer
+        self._queue: "queue.Queue[Tuple]" = queue.Queue(maxsize=_MAX_QUEUED)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def put(self, row: Tuple) -> None:
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            logger.warning("Activity log queue full; writing entry synchronously")
+            self._writer([row])
+
+    def flush(self) -> None:
+        """Write everything still queued (used at interpreter exit)."""
+        batch = self._drain(block=False)
+        while batch:
+            self._write(batch)
+            batch = self._drain(block=False)
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="activity-log-writer", daemon=True)
+                self._thread.start()
+
+    def _drain(self, block: bool = True) -> List[Tuple]:
+        batch: List[Tuple] = []
+        try:
+            batch.append(self._queue.get(timeout=_DRAIN_TIMEOUT) if block else self._queue.get_nowait())
+            while len(batch) < _BATCH_SIZE:
+                batch.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        return batch
+
+    def _write(self, batch: List[Tuple]) -> None:
+        try:
+            self._writer(batch)
+        except Exception as e:
+            logger.error(f"Failed to write {len(batch)} activity log entries: {e}")
+
+    def _run(self) -> None:
+        while True:
+            batch = self._drain()
+            if batch:
+                self._write(batch)
+
+
+def _bulk_insert(rows: List[Tuple]) -> None:
+    from app.database.models.activity_model import ActivityLog
+    ActivityLog.bulk_insert(rows)
+
+
+activity_queue = ActivityLogQueue(_bulk_insert)
+atexit.register(activity_queue.flush)
@@ -0,0 +1,32 @@
+from typing import Optional, Tuple
+
+from flask import request
+
+_TRUE = frozenset({'true', '1', 'yes', 'on'})
+
+
+def qbool(name: str, default: bool = False) -> bool:
+    """
+    Read a boolean query-string flag (e.g. ?include_deleted=true).
+    Returns the default when the parameter is absent.
+    """
+    value = request.args.get(name)
+    if value is None:
+        return default
+    return value.lower() in _TRUE
+
+
+def qfields(allowed) -> Optional[Tuple[str, ...]]:
+    """
+    Read a sparse fieldset (e.g. ?fields=id,amount,created_at) for list endpoints.
+    Returns None when the parameter is absent or empty; raises ValueError
+    naming any field that is not in `allowed`.
+    """
+    value = request.args.get('fields')
+    if not value:
+        return None
+    names = tuple(dict.fromkeys(name.strip() for name in value.split(',') if name.strip()))
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+    return names or None
@@ -4,6 +4,9 @@ from uuid6 import uuid7
 from app.database.db_manager import DBManager
 from app.database.models.user import User
 
+# MySQL error raised by CREATE INDEX when the index is already there
+ER_DUP_KEYNAME = 1061
+
 def init_db():
     """
     Initialize database:
@@ -73,6 +76,8 @@ def init_db():
                 try:
                     cursor.execute(statement)
                 except Exception as e:
+                    if e.args and e.args[0] == ER_DUP_KEYNAME:
+                        continue  # index already exists
                     print(f"⚠️ Error executing schema statement: {e}")
 
         connection.commit()
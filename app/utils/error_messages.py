@@ -45,6 +45,7 @@ ERROR_MESSAGES = {
         "missing_token": "Missing authorization token. Please provide a valid token.",
         "unauthorized": "Unauthorized access. You do not have permission to perform this action.",
         "invalid_credentials": "Invalid credentials. Please check your username or email and password.",
+        "too_many_attempts": "Too many failed sign-in attempts. Please try again in a minute.",
     },
     "conflict": {"user_exists": "A user with this email address already exists."},
 }
@@ -1,16 +1,53 @@
+import copy
+import re
+from collections import OrderedDict
+from hashlib import blake2b
+from threading import Lock
 from typing import Any, Dict, List, Optional, Callable, Type
 from flask import request
 from marshmallow import ValidationError, Schema
 from app.utils.response import error_response, success_response
 from app.utils.error_messages import ERROR_MESSAGES
 
+# Record ids are uuid7 strings in canonical 8-4-4-4-12 form.
+UUID_RE = re.compile(r'^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$')
+MAX_BULK_IDS = 1000
+
+# LRU of validated payloads keyed by (schema class, partial flags, body digest), so retried
+# or double-submitted requests skip re-running schema validation.
+_VALIDATION_CACHE_SIZE = 1024
+_validation_cache: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+_validation_cache_lock = Lock()
+
+def _is_cacheable_schema(schema: Schema) -> bool:
+    """
+    Schemas with callable load defaults (e.g. date.today) must be re-run every time,
+    and password payloads are never kept in memory.
+    """
+    if schema.only or schema.exclude:
+        return False
+    return not any(
+        callable(field.load_default) or 'password' in name
+        for name, field in schema.fields.items()
+    )
+
 def validate_request(schema: Schema, data: Optional[Dict[str, Any]] = None, partial: bool = False) -> Dict[str, Any]:
     """
     Validate request data against Marshmallow schema.
     If data is not provided, it tries to get it from request.get_json().
     """
+    cache_key = None
     if data is None:
         data = request.get_json() or {}
+        if _is_cacheable_schema(schema):
+            digest = blake2b(request.get_data(cache=True), digest_size=16).digest()
+            cache_key = (type(schema), schema.partial, partial, digest)
+            with _validation_cache_lock:
+                cached = _validation_cache.get(cache_key)
+                if cached is not None:
+                    _validation_cache.move_to_end(cache_key)
+            if cached is not None:
+                return copy.deepcopy(cached)
 
     if not data and not partial:
          # If partial is True, empty data might be valid (though rare for updates usually)
@@ -22,10 +59,17 @@ def validate_request(schema: Schema, data: Optional[Dict[str, Any]] = None, part
          raise ValidationError(ERROR_MESSAGES["validation"]["request_body_empty"])
 
     try:
-        return schema.load(data, partial=partial)
+        validated = schema.load(data, partial=partial)
     except ValidationError as err:
         raise ValueError(err.messages)
 
+    if cache_key is not None:
+        with _validation_cache_lock:
+            _validation_cache[cache_key] = copy.deepcopy(validated)
+            if len(_validation_cache) > _VALIDATION_CACHE_SIZE:
+                _validation_cache.popitem(last=False)
+    return validated
+
 def get_or_404(model: Type, record_id: str, resource_name: str = "resource", include_deleted: bool = False):
     """
     Fetch a record by ID or return a 404 error response.
@@ -41,6 +85,13 @@ def get_or_404(model: Type, record_id: str, resource_name: str = "resource", inc
         return None
     return record
 
+def sanitize_bulk_ids(ids: List[Any]) -> List[str]:
+    """
+    Drop malformed and duplicate ids from a bulk payload, preserving order,
+    so the DB never sees ids that cannot match a row.
+    """
+    return list(dict.fromkeys(i for i in ids if isinstance(i, str) and UUID_RE.match(i)))
+
 def bulk_action_handler(ids: List[str], action_func: Callable[[List[str]], int], success_msg_template: str, not_found_msg: str):
     """
     Generic handler for bulk restore / soft-delete actions.
@@ -0,0 +1,60 @@
+from decimal import Decimal
+
+import orjson
+from flask import Request
+from flask.json.provider import JSONProvider
+
+# Options shared by every orjson.dumps call; non-str keys are allowed, as with json.dumps
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def json_default(o):
+    """
+    orjson fallback for types it does not encode natively.
+    Decimals keep the API's existing shape: whole numbers become ints, others floats.
+    """
+    if isinstance(o, Decimal):
+        return int(o) if o == o.to_integral_value() else float(o)
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+def dumps_bytes(obj) -> bytes:
+    """Serialize obj to JSON bytes with orjson and the app's default handler."""
+    return orjson.dumps(obj, default=json_default, option=ORJSON_OPTIONS)
+
+
+class OrjsonProvider(JSONProvider):
+    """
+    Flask JSON provider backed by orjson, used by jsonify() and app.json.
+    """
+
+    def dumps(self, obj, **kwargs):
+        return dumps_bytes(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps_bytes(obj), mimetype="application/json")
+
+
+class _OrjsonModule:
+    """
+    Minimal stand-in for the json module that Werkzeug uses inside get_json().
+    orjson.JSONDecodeError subclasses ValueError, so malformed bodies still
+    end up in on_json_loading_failed() exactly like they do with stdlib json.
+    """
+    loads = staticmethod(orjson.loads)
+
+    @staticmethod
+    def dumps(obj, **kwargs):
+        return orjson.dumps(obj).decode()
+
+
+class OrjsonRequest(Request):
+    """
+    Request class that parses JSON bodies with orjson instead of stdlib json.
+    Routes keep calling request.get_json() unchanged.
+    """
+    json_module = _OrjsonModule
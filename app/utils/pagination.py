@@ -1,5 +1,12 @@
+import base64
+import binascii
+from typing import Optional
+
+import orjson
 from flask import request
 
+from app.utils.helpers import UUID_RE
+
 def get_pagination():
     try:
         page = int(request.args.get("page", 1))
@@ -9,3 +16,33 @@ def get_pagination():
     page = max(page, 1)
     per_page = max(min(per_page, 100), 1)
     return page, per_page
+
+def page_meta(items, total, page, per_page, **extra):
+    """
+    Meta block for list responses. When the total was not counted (?with_total=false),
+    `has_more` reports whether the page came back full, the same rule next_cursor uses.
+    """
+    if total is None:
+        return {'page': page, 'per_page': per_page, 'has_more': len(items) == per_page, **extra}
+    return {'total': total, 'page': page, 'per_page': per_page, **extra}
+
+def encode_cursor(last_id: str) -> str:
+    """Opaque keyset cursor pointing just past the row with `last_id`."""
+    return base64.urlsafe_b64encode(orjson.dumps({"id": last_id})).decode().rstrip("=")
+
+def get_cursor() -> Optional[str]:
+    """
+    Return the last-seen id from the `cursor` query arg, or None when absent or malformed
+    (callers then fall back to page/offset pagination).
+    """
+    token = request.args.get("cursor")
+    if not token:
+        return None
+    try:
+        payload = orjson.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    except (binascii.Error, ValueError):
+        return None
+    last_id = payload.get("id") if isinstance(payload, dict) else None
+    if not isinstance(last_id, str) or not UUID_RE.match(last_id):
+        return None
+    return last_id
@@ -0,0 +1,45 @@
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock
+from typing import Callable, Dict, Hashable
+
+from app.utils.ttl_cache import TTLCache
+
+
+class BackgroundPdfRenderer:
+    """
+    Renders PDFs on a small thread pool and stores the bytes in a TTLCache.
+    Concurrent requests for the same key share one in-flight render, so a client
+    that retries while a render is still running does not start another one.
+    """
+
+    def __init__(self, cache: TTLCache, max_workers: int = 2):
+        self.cache = cache
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pdf-render")
+        self._inflight: Dict[Hashable, Future] = {}
+        self._lock = Lock()
+
+    def submit(self, key: Hashable, render: Callable[[], bytes]) -> Future:
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is None:
+                future = self._executor.submit(self._render, key, render)
+                self._inflight[key] = future
+            return future
+
+    def _render(self, key: Hashable, render: Callable[[], bytes]) -> bytes:
+        try:
+            pdf_bytes = render()
+            self.cache.set(key, pdf_bytes)
+            return pdf_bytes
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+
+# How long a download request waits for a fresh render before answering 202
+PDF_SYNC_WAIT_SECONDS = float(os.getenv("PDF_SYNC_WAIT_SECONDS", "10"))
+
+# Rendered PDF bytes; keys are digests of the exact render input, so entries never go stale
+invoice_pdf_cache = TTLCache(max_entries=128, ttl_seconds=86400)
+invoice_pdf_renderer = BackgroundPdfRenderer(invoice_pdf_cache, max_workers=int(os.getenv("PDF_RENDER_WORKERS", "2")))
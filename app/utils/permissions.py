@@ -49,9 +49,12 @@ PERMISSIONS = {
     'activities.view_all': 'View all system activities',
 }
 
+# Every permission key, in declaration order; what an admin effectively has
+ALL_PERMISSIONS = tuple(PERMISSIONS)
+
 # Default permissions for each role
 DEFAULT_ROLE_PERMISSIONS = {
-    'admin': list(PERMISSIONS.keys()),
+    'admin': list(ALL_PERMISSIONS),
     'manager': [
         'dashboard.view',
         'customers.list', 'customers.view', 'customers.create', 'customers.update', 'customers.delete', 'customers.restore',
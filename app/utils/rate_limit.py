@@ -0,0 +1,58 @@
+import time
+from collections import deque
+from threading import Lock
+from typing import Deque, Dict
+
+
+class FailedAttemptLimiter:
+    """
+    Sliding-window counter of failed attempts per key (e.g. client IP).
+    Kept in memory per worker process, like the token blocklist.
+    Keys whose window has passed are swept once per window, and at most
+    max_keys are tracked; past that the oldest keys are dropped first.
+    """
+
+    def __init__(self, max_attempts: int, window_seconds: int, max_keys: int = 10000):
+        self.max_attempts = max_attempts
+        self.window_seconds = window_seconds
+        self.max_keys = max_keys
+        self._attempts: Dict[str, Deque[float]] = {}
+        self._lock = Lock()
+        self._last_sweep = time.monotonic()
+
+    def _prune(self, key: str, now: float) -> Deque[float]:
+        attempts = self._attempts.get(key)
+        if attempts is None:
+            return deque()
+        cutoff = now - self.window_seconds
+        while attempts and attempts[0] <= cutoff:
+            attempts.popleft()
+        if not attempts:
+            del self._attempts[key]
+        return attempts
+
+    def _sweep(self, now: float) -> None:
+        cutoff = now - self.window_seconds
+        expired = [key for key, attempts in self._attempts.items() if not attempts or attempts[-1] <= cutoff]
+        for key in expired:
+            del self._attempts[key]
+        self._last_sweep = now
+
+    def is_blocked(self, key: str) -> bool:
+        with self._lock:
+            return len(self._prune(key, time.monotonic())) >= self.max_attempts
+
+    def record_failure(self, key: str) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._prune(key, now)
+            if key not in self._attempts:
+                if now - self._last_sweep >= self.window_seconds or len(self._attempts) >= self.max_keys:
+                    self._sweep(now)
+                while len(self._attempts) >= self.max_keys:
+                    del self._attempts[next(iter(self._attempts))]
+            self._attempts.setdefault(key, deque()).append(now)
+
+    def reset(self, key: str) -> None:
+        with self._lock:
+            self._attempts.pop(key, None)
@@ -1,38 +1,53 @@
 from flask import current_app
-import json
-from decimal import Decimal
-from datetime import datetime
+import orjson
+from app.utils.json_provider import dumps_bytes
 
-class CustomJSONEncoder(json.JSONEncoder):
-    """
-    Custom JSON encoder to handle special data types like Decimal and datetime.
-    """
-    def default(self, o):
-        if isinstance(o, Decimal):
-            # If the number is a whole number, convert to int, otherwise convert to float
-            if o == o.to_integral_value():
-                return int(o)
-            else:
-                return float(o)
-        if isinstance(o, datetime):
-            # Convert datetime to ISO 8601 string format
-            return o.isoformat()
-        return super().default(o)
+def success_body(result=None, message="Success", meta=None) -> bytes:
+    """
+    Encoded body of a standardized success response. Endpoints whose payload never
+    changes can build this once at import and serve it with body_response().
+    """
+    return dumps_bytes(
+        {
+            "success": True,
+            "message": message,
+            "data": {"results": result or [], "meta": meta or {}},
+        }
+    )
+
+def body_response(body: bytes, status=200):
+    """
+    Wraps an already encoded JSON body in the (response, status) pair routes return.
+    """
+    return (
+        current_app.response_class(response=body, status=status, mimetype="application/json"),
+        status,
+    )
 
 def success_response(result=None, message="Success", meta=None, status=200):
     """
-    Creates a standardized success JSON response using the custom encoder.
+    Creates a standardized success JSON response (serialized with orjson).
+    """
+    return body_response(success_body(result, message, meta), status)
+
+def success_response_streaming(rows, dump, message="Success", meta=None, status=200):
+    """
+    Streaming variant of success_response for list endpoints.
+    Rows are passed through dump() and encoded one at a time, so the full result list is
+    never materialized as a second Python structure or one big JSON string.
+    The body has the same envelope as success_response.
     """
+    def generate():
+        yield b'{"success":true,"message":' + orjson.dumps(message) + b',"data":{"results":['
+        for index, row in enumerate(rows):
+            if index:
+                yield b','
+            yield dumps_bytes(dump(row))
+        yield b'],"meta":' + dumps_bytes(meta or {}) + b'}}'
+
     return (
         current_app.response_class(
-            response=json.dumps(
-                {
-                    "success": True,
-                    "message": message,
-                    "data": {"results": result or [], "meta": meta or {}},
-                },
-                cls=CustomJSONEncoder  # Use the custom encoder
-            ),
+            generate(),
             status=status,
             mimetype="application/json",
         ),
@@ -45,7 +60,7 @@ def error_response(error_code="bad_request", message="An error occurred.", detai
     """
     return (
         current_app.response_class(
-            response=json.dumps(
+            response=dumps_bytes(
                 {
                     "success": False,
                     "error": {
@@ -10,39 +10,58 @@ from app.database.db_manager import DBManager
 from app.database.models.invoice import Invoice
 from app.database.models.payment import Payment
 
+DECIMAL_ZERO = Decimal('0.00')
+_HUNDRED = Decimal('100.00')
+
+def to_decimal(value) -> Decimal:
+    """Return value as a Decimal, skipping the re-parse when it already is one."""
+    return value if isinstance(value, Decimal) else Decimal(value)
+
 def short_customer_code(customer_id: str, length: int = 4) -> str:
     """Generate a short customer code from UUID or integer ID"""
     customer_id_str = str(customer_id)
     hash_val = hashlib.md5(customer_id_str.encode()).hexdigest()
     return hash_val[:length].upper()
 
+_INVOICE_SEQUENCE = 'invoice_number'
+
+def next_invoice_sequence() -> int:
+    """
+    Atomically take the next global invoice sequence number.
+    The counter row stays locked until the surrounding transaction commits, so
+    concurrent invoice creations can never be handed the same number.
+    """
+    with DBManager.transaction():
+        matched = DBManager.execute_write_query(
+            "UPDATE invoice_sequence SET value = LAST_INSERT_ID(value + 1) WHERE name = %s",
+            (_INVOICE_SEQUENCE,),
+            return_rowcount=True
+        )
+        if not matched:
+            # First use: seed the counter from the highest number already issued
+            DBManager.execute_write_query(
+                """
+                INSERT INTO invoice_sequence (name, value)
+                SELECT %s, LAST_INSERT_ID(COALESCE(MAX(CAST(SUBSTRING_INDEX(invoice_number, '-', -1) AS UNSIGNED)), 0) + 1)
+                FROM invoices
+                WHERE invoice_number REGEXP 'INV-[0-9]{6}-[A-Z0-9]+-[0-9]{3}'
+                ON DUPLICATE KEY UPDATE value = LAST_INSERT_ID(value + 1)
+                """,
+                (_INVOICE_SEQUENCE,)
+            )
+        result = DBManager.execute_query("SELECT LAST_INSERT_ID() AS seq", fetch="one")
+    return int(result["seq"])
+
 def generate_invoice_number(customer_id: str) -> str:
     """
     Generate sequential invoice number with format:
     INV-YYYYMM-CODE-SEQ
-    Works with DBManager directly (no raw connection needed)
+    The sequence comes from the invoice_sequence counter, not a scan of invoices.
     """
     ym = datetime.now().strftime("%Y%m")
     cust_code = short_customer_code(customer_id)
 
-    # Get the maximum global sequence number
-    query = """
-        SELECT MAX(CAST(SUBSTRING_INDEX(invoice_number, '-', -1) AS UNSIGNED)) AS max_seq
-        FROM invoices
-        WHERE invoice_number REGEXP 'INV-[0-9]{6}-[A-Z0-9]+-[0-9]{3}'
-    """
-    result = DBManager.execute_query(query, fetch="one")
-    max_seq = 0
-    if (
-        result
-        and isinstance(result, dict)
-        and "max_seq" in result
-        and result["max_seq"] is not None
-    ):
-        max_seq = int(result["max_seq"])
-
-    seq = max_seq + 1
-    seq_str = str(seq).zfill(3)
+    seq_str = str(next_invoice_sequence()).zfill(3)
     return f"INV-{ym}-{cust_code}-{seq_str}"
 
 def generate_unique_product_code(product_name):
@@ -85,21 +104,30 @@ def generate_unique_product_code(product_name):
         if conn:
             conn.close()
 
-def calculate_invoice_totals(items, discount_amount=Decimal('0.00'), tax_percent=Decimal('0.00')):
+def calculate_invoice_totals(items, discount_amount=DECIMAL_ZERO, tax_percent=DECIMAL_ZERO):
     """Calculate subtotal, tax, and total amounts."""
-    subtotal = sum(Decimal(item['price']) * Decimal(item['quantity']) for item in items)
-    tax_amount = (subtotal - discount_amount) * (tax_percent / Decimal('100.00'))
+    subtotal = sum((to_decimal(item['price']) * int(item['quantity']) for item in items), DECIMAL_ZERO)
+    return calculate_totals_from_subtotal(subtotal, discount_amount, tax_percent)
+
+
+def calculate_totals_from_subtotal(subtotal, discount_amount=DECIMAL_ZERO, tax_percent=DECIMAL_ZERO):
+    """Calculate subtotal, tax, and total amounts from an already known subtotal."""
+    tax_amount = (subtotal - discount_amount) * (tax_percent / _HUNDRED)
     total = subtotal - discount_amount + tax_amount
     return subtotal, tax_amount, total
 
 
-def update_invoice_status(invoice_id, total_amount):
-    """Update invoice status based on payments."""
-    payments = Payment.find_by_invoice_id(invoice_id)
-    total_paid = sum((p.amount or 0) for p in payments if p)
+def update_invoice_status(invoice_id, total_amount, current_status=None, total_paid=None):
+    """
+    Update invoice status based on payments.
+    When the caller knows the stored status, the UPDATE is skipped if it would not change;
+    a total_paid summed earlier in the same transaction saves re-summing payments.
+    """
+    if total_paid is None:
+        total_paid = Payment.get_total_paid(invoice_id)
 
-    # Ensure total_amount is Decimal for comparison
-    total_amount = Decimal(str(total_amount))
+    # Ensure total_amount is Decimal for comparison (callers usually pass one already)
+    total_amount = to_decimal(total_amount)
 
     if total_paid >= total_amount:
         status = 'Paid'
@@ -108,7 +136,8 @@ def update_invoice_status(invoice_id, total_amount):
     else:
         status = 'Pending'
 
-    Invoice.update(invoice_id, {'status': status})
+    if status != current_status:
+        Invoice.update(invoice_id, {'status': status})
     return status
 
 
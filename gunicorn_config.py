@@ -19,7 +19,13 @@ threads = int(os.getenv("GUNICORN_THREADS", "8"))
 
 # Worker Class:
 # 'gthread' is standard for threaded workers.
-worker_class = "gthread"
+# Set GUNICORN_WORKER_CLASS=gevent to multiplex many in-flight requests per worker;
+# gunicorn monkey-patches sockets for gevent, and PyMySQL is pure Python, so DB calls
+# yield to other greenlets without any driver-specific patching.
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+
+# Max concurrent greenlets per worker (only used by the gevent worker class).
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", "1000"))
 
 # Timeout:
 # Cloud Run defaults to 300s (5 mins), but web requests should be faster.